@@ -313,6 +313,7 @@ class RingBuffer:
             raise ValueError("Buffer size must be at least 2 bytes")
             
         self._buf = bytearray(size)
+        self._view = memoryview(self._buf)  # slices of this copy nothing
         self._size = size
         self._head = 0
         self._tail = 0
@@ -368,7 +369,8 @@ class RingBuffer:
         part2 = self._buf[:(self._tail + n) % self._size]
         return bytes(part1 + part2)
     
-    def get_until(self, pattern: bytes, max_size: int | None = None) -> bytes | None:
+    def _match_length(self, pattern: bytes, max_size: int | None) -> int:
+        # Bytes up to and including the first match of pattern, or 0 if none
         if not isinstance(pattern, (bytes, bytearray)):
             raise TypeError("Pattern must be bytes or bytearray")
         if len(pattern) == 0:
@@ -377,13 +379,35 @@ class RingBuffer:
         max_search = min(self.avail(), max_size) if max_size else self.avail()
         
         if max_search < len(pattern):
-            return None
+            return 0
 
         pattern_start = __ring_buffer_find_pattern(self._buf, self._size, self._head, self._tail, pattern, len(pattern), max_search)
         
         if pattern_start == -1:
-            return None
+            return 0
         
-        length = pattern_start + len(pattern)
+        return pattern_start + len(pattern)
+
+    def get_until(self, pattern: bytes, max_size: int | None = None) -> bytes | None:
+        length = self._match_length(pattern, max_size)
+        if length == 0:
+            return None
 
         return self.get(length)
+
+    @micropython.native
+    def get_until_into(self, buf, pattern: bytes, max_size: int | None = None) -> int:
+        length = self._match_length(pattern, max_size)
+        if length == 0:
+            return 0
+        if length > len(buf):
+            raise ValueError("Destination buffer too small")
+
+        tail = self._tail
+        first = min(length, self._size - tail)
+        view = self._view
+        buf[:first] = view[tail:tail + first]
+        if first < length:
+            buf[first:length] = view[:length - first]
+        self._tail = (tail + length) % self._size
+        return length
@@ -855,12 +855,12 @@ class Pwm:
         for i in indices:
             period_us = Pwm.__MICROS_PER_SEC // parent._freq_hz[i]
             duty_pct = int(duty_us * 100 / period_us)
-            duty_pct = max(0, min(100, duty_pct))
+            duty_pct = 0 if duty_pct < 0 else 100 if duty_pct > 100 else duty_pct
             parent._duty_pct[i] = duty_pct
             
             if parent._enabled[i]:
                 duty_raw = int(duty_us * Pwm.__FULL_RANGE / period_us)
-                duty_raw = max(0, min(Pwm.__FULL_RANGE, duty_raw))
+                duty_raw = 0 if duty_raw < 0 else Pwm.__FULL_RANGE if duty_raw > Pwm.__FULL_RANGE else duty_raw
                 parent._pwm[i].duty_u16(duty_raw)
             else:
                 parent._pwm[i].duty_u16(0)
@@ -886,8 +886,7 @@ class Pwm:
 
         def __getitem__(self, idx: int|slice) -> "Pwm._PwmView":
             if isinstance(idx, slice):
-                selected_indices = [self._indices[i] for i in range(*idx.indices(len(self._indices)))]
-                return Pwm._PwmView(self._parent, selected_indices)
+                return Pwm._PwmView(self._parent, self._indices[idx])
             else:
                 return Pwm._PwmView(self._parent, [self._indices[idx]])
 
@@ -1012,6 +1011,8 @@ def i2cdetect(show: bool = False) -> list | None:
 
 
 class I2c:
+    __BUS_POOL = {}
+
     def __init__(self, scl:int, sda:int, addr:int, freq:int=400_000):     
         I2C_PIN_MAP = {
             0: {'sda': {0,4,8,12,16,20}, 'scl': {1,5,9,13,17,21}},
@@ -1027,7 +1028,12 @@ class I2c:
             raise ValueError(f"Invalid I2C pins: SDA={sda}, SCL={scl}")
 
         self.__addr = addr
-        self.__i2c = machine.I2C(bus, scl=machine.Pin(scl), sda=machine.Pin(sda), freq=freq)
+        key = (bus, scl, sda, freq)
+        i2c = I2c.__BUS_POOL.get(key)
+        if i2c is None:
+            i2c = machine.I2C(bus, scl=machine.Pin(scl), sda=machine.Pin(sda), freq=freq)
+            I2c.__BUS_POOL[key] = i2c
+        self.__i2c = i2c
 
     def read_u8(self, reg:int) -> int:
         data = self.__i2c.readfrom_mem(self.__addr, reg, 1)
@@ -1070,6 +1076,8 @@ class ReplSerial:
         self._stdin     = usys.stdin.buffer
         self._stdout    = usys.stdout
         self._buf       = utools.RingBuffer(bufsize)
+        self._linebuf   = bytearray(bufsize)
+        self._linemv    = memoryview(self._linebuf)
         self._scheduled = False
         self._tmr = machine.Timer(-1)
         self._tmr.init(period=poll_ms, mode=machine.Timer.PERIODIC, callback=self.__tick)
@@ -1123,8 +1131,8 @@ class ReplSerial:
             if max_size and self._buf.avail() >= max_size:
                 return self._buf.get(max_size)
             
-            data = self._buf.get_until(expected, max_size)
-            return data or b''
+            n = self._buf.get_until_into(self._linemv, expected, max_size)
+            return bytes(self._linemv[:n])
 
         deadline = None
         if self._timeout is not None:
@@ -1134,9 +1142,9 @@ class ReplSerial:
             if max_size and self._buf.avail() >= max_size:
                 return self._buf.get(max_size)
 
-            data = self._buf.get_until(expected, max_size)
-            if data is not None:
-                return data
+            n = self._buf.get_until_into(self._linemv, expected, max_size)
+            if n:
+                return bytes(self._linemv[:n])
 
             if deadline is not None:
                 if utime.ticks_diff(deadline, utime.ticks_ms()) <= 0:
@@ -1159,6 +1167,14 @@ def input(prompt:str="") -> str:
     def __char_width(ch: str) -> int:
         return 1 if len(ch.encode('utf-8')) == 1 else 2
 
+    @micropython.native
+    def __str_width(s: str) -> int:
+        w = len(s)
+        for c in s:
+            if ord(c) >= 0x80:
+                w += 1
+        return w
+
     repl_in = usys.stdin.buffer
     repl_out = usys.stdout
     
@@ -1215,7 +1231,7 @@ def input(prompt:str="") -> str:
                 tail = ''.join(buf[pos:])
                 if tail:
                     repl_out.write(tail.encode('utf-8'))
-                    ws = sum(__char_width(c) for c in tail)
+                    ws = __str_width(tail)
                     repl_out.write(f"\x1b[{ws}D".encode())
             continue
 
@@ -1228,7 +1244,7 @@ def input(prompt:str="") -> str:
             tail = ''.join(buf[pos:])
             if tail:
                 repl_out.write(tail.encode('utf-8'))
-                ws = sum(__char_width(c) for c in tail)
+                ws = __str_width(tail)
                 repl_out.write(f"\x1b[{ws}D".encode())
             continue
 
@@ -1256,7 +1272,7 @@ def input(prompt:str="") -> str:
         repl_out.write(seq)
         if tail:
             repl_out.write(tail.encode('utf-8'))
-            ws = sum(__char_width(c) for c in tail)
+            ws = __str_width(tail)
             repl_out.write(f"\x1b[{ws}D".encode())
         pos += 1
 
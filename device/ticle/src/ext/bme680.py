@@ -2,29 +2,56 @@ __version__ = "1.0.0"
 __author__ = "PlanX Lab Development Team"
 
 from . import (
-    math, utime, ustruct,
+    math, utime, ustruct, array,
     machine, micropython,
     I2c
 )
+from micropython import const
 
+_FORCED_MODE      = const(0x01)
+_SLEEP_MODE       = const(0x00)
+_REG_STATUS       = const(0x1D)
+_REG_CTRL_GAS1    = const(0x71)
+_REG_GAS_WAIT_0   = const(0x64)
+_BIT_NEW_DATA     = const(0x80)
+_BITS_GAS_OK      = const(0x30)
+
+_NORM_BASE_PERIOD = const(3000)  # ms
+
+# ctrl_gas1 values for run_gas off/on (run_gas=[4], nb_conv=0)
+_CTRL_GAS1_VALS = (0x00, 0x10)
+
+_CQ_MAX = const(4)  # timer ticks buffered while a callback sample is still running
+
+# Calibration block layouts (little endian, x = unused register)
+# 0x8A..0xA0: T2 T3 - P1 P2 P3 - P4 P5 P7 P6 - - P8 P9 P10
+_CAL1_FMT = '<hbxHhbxhhbbxxhhB'
+# 0xE1..0xEE: H2_MSB H1_LSB/H2_LSB H1_MSB H3 H4 H5 H6 H7 T1 GH2 GH1 GH3
+_CAL2_FMT = '<BBBbbbBbHhbb'
+# 0x00..0x04: res_heat_val - res_heat_range - range_sw_err
+_CAL3_FMT = '<bxBxB'
+
+# Gas resistance range lookup (k1 per gas_range)
+_GAS_LOOKUP = array.array('l', (
+    2147483647, 2147483647, 2147483647, 2147483647,
+    2147483647, 2126008810, 2147483647, 2130303777,
+    2147483647, 2147483647, 2143188679, 2136746228,
+    2147483647, 2126008810, 2147483647, 2147483647
+))
 
-class BME680:
-    __FORCED_MODE      = 0x01
-    __SLEEP_MODE       = 0x00
-    __REG_STATUS       = 0x1D
-    __REG_CTRL_GAS1    = 0x71
-    __REG_GAS_WAIT_0   = 0x64
-    __BIT_NEW_DATA     = 0x80
-    __BITS_GAS_OK      = 0x30
-    
-    __NORM_BASE_PERIOD = 3000  # ms
 
+class BME680:
     def __init__(self, scl: int, sda: int,
                  *,
                  address: int = 0x77,
                  freq: int = 400_000
         ):
         self.__i2c = I2c(scl=scl, sda=sda, addr=address, freq=freq)
+        # Scratch for single-register writes: __drain runs from micropython.schedule and can
+        # preempt user code mid-write, so the two contexts never share a buffer
+        self.__tx1 = bytearray(1)       # __drain path
+        self.__tx1_user = bytearray(1)  # everything else
+        self.__in_drain = False
         
         chip_id = self.__i2c.readfrom_mem(0xD0, 1)[0]
         if chip_id != 0x61:
@@ -35,7 +62,7 @@ class BME680:
         utime.sleep_ms(5)
 
         # sleep mode
-        self.__set_power_mode(self.__SLEEP_MODE)
+        self.__set_power_mode(_SLEEP_MODE)
 
         # == Calibration value parsing (datasheet specification) =====
         # Block 1: 0x8A.. (23B): T2/T3, P1..P10 etc.
@@ -45,63 +72,50 @@ class BME680:
         # Block 3: 0x00.. (5B): res_heat_val(0x00), res_heat_range(0x02[5:4]), range_sw_err(0x04[7:4])
         cal3 = self.__i2c.readfrom_mem(0x00, 5)
 
+        (par_t2, par_t3,
+         par_p1, par_p2, par_p3, par_p4, par_p5, par_p7, par_p6,
+         par_p8, par_p9, par_p10) = ustruct.unpack_from(_CAL1_FMT, cal1, 0)
+        (h2_msb, h1_lsb, h1_msb,
+         par_h3, par_h4, par_h5, par_h6, par_h7,
+         par_t1, par_gh2, par_gh1, par_gh3) = ustruct.unpack_from(_CAL2_FMT, cal2, 0)
+        res_heat_val, res_heat_r, sw_err_r = ustruct.unpack_from(_CAL3_FMT, cal3, 0)
+
         # Temperature calibration (par_t1, par_t2, par_t3)
-        par_t2 = ustruct.unpack('<h', cal1[0:2])[0]        # 0x8A-0x8B (s16)
-        par_t3 = ustruct.unpack('b',  cal1[2:3])[0]        # 0x8C     (s8)
-        par_t1 = ustruct.unpack('<H', cal2[8:10])[0]       # 0xE9-0xEA (u16)
         self.__par_t1, self.__par_t2, self.__par_t3 = par_t1, par_t2, par_t3
 
         # Pressure calibration (par_p1..par_p10) 
-        par_p1  = ustruct.unpack('<H', cal1[4:6])[0]       # u16
-        par_p2  = ustruct.unpack('<h', cal1[6:8])[0]       # s16
-        par_p3  = ustruct.unpack('b',  cal1[8:9])[0]       # s8
-        par_p4  = ustruct.unpack('<h', cal1[10:12])[0]     # s16
-        par_p5  = ustruct.unpack('<h', cal1[12:14])[0]     # s16
-        par_p7  = ustruct.unpack('b',  cal1[14:15])[0]     # s8
-        par_p6  = ustruct.unpack('b',  cal1[15:16])[0]     # s8
-        par_p8  = ustruct.unpack('<h', cal1[18:20])[0]     # s16
-        par_p9  = ustruct.unpack('<h', cal1[20:22])[0]     # s16
-        par_p10 = cal1[22]                                                    # 0xA0
         self.__pressure_calibration = [par_p1, par_p2, par_p3, par_p4, par_p5, par_p6, par_p7, par_p8, par_p9, par_p10]
 
         # Humidity calibration (par_h1..par_h7) — H1/H2 is bit mixing
         # E1: H2_MSB, E2: H2_LSB/H1_LSB, E3: H1_MSB
-        h2_msb = cal2[0]           # 0xE1
-        h1_lsb = cal2[1]           # 0xE2 (low nibble for H1, high nibble for H2)
-        h1_msb = cal2[2]           # 0xE3
         par_h1 = (h1_msb << 4) | (h1_lsb & 0x0F)
         par_h2 = (h2_msb << 4) | (h1_lsb >> 4)
-
-        par_h3 = ustruct.unpack('b', bytes([cal2[3]]))[0]  # 0xE4
-        par_h4 = ustruct.unpack('b', bytes([cal2[4]]))[0]  # 0xE5
-        par_h5 = ustruct.unpack('b', bytes([cal2[5]]))[0]  # 0xE6
-        par_h6 = cal2[6]                                   # 0xE7 (u8)
-        par_h7 = ustruct.unpack('b', bytes([cal2[7]]))[0]  # 0xE8
         self.__humidity_calibration = [par_h1, par_h2, par_h3, par_h4, par_h5, par_h6, par_h7]
 
-        # Gas/Heater calibration
-        par_gh2 = ustruct.unpack('<h', cal2[10:12])[0]     # 0xEB-0xEC
-        par_gh1 = ustruct.unpack('b',  cal2[12:13])[0]     # 0xED
-        par_gh3 = ustruct.unpack('b',  cal2[13:14])[0]     # 0xEE
-        self.__par_gh1, self.__par_gh2, self.__par_gh3 = par_gh1, par_gh2, par_gh3
-
-        res_heat_val   = ustruct.unpack('b', bytes([cal3[0]]))[0]  # 0x00 (signed)
-        res_heat_range = (cal3[2] >> 4) & 0x03                     # 0x02[5:4]
-        range_sw_err   = (cal3[4] >> 4) & 0x0F                     # 0x04[7:4]
-        self.__res_heat_val   = res_heat_val
-        self.__res_heat_range = res_heat_range
-        self.__sw_err         = range_sw_err
+        # Gas/Heater calibration, folded into the terms of __calc_res_heat that never change
+        res_heat_range = (res_heat_r >> 4) & 0x03                  # 0x02[5:4]
+        range_sw_err   = (sw_err_r >> 4) & 0x0F                    # 0x04[7:4]
+        self.__rh_gh1  = par_gh1 + 784
+        self.__rh_gh2  = par_gh2 + 154009
+        self.__rh_gh3  = par_gh3
+        self.__rh_div  = res_heat_range + 4
+        self.__rh_var5 = (131 * res_heat_val) + 65536
+        self.__sw_err  = range_sw_err
 
         # Measurement/Filter Settings
+        osrs_t, osrs_p, osrs_h = 0b010, 0b011, 0b001
         # ctrl_hum (0x72): OSRS_H = x1
-        self.__i2c.writeto_mem(0x72, bytes([0b001]))
+        self.__i2c.writeto_mem(0x72, bytes([osrs_h]))
         # ctrl_meas (0x74): OSRS_T = x2 (010), OSRS_P = x4 (011), mode is set in the function
-        self.__i2c.writeto_mem(0x74, bytes([(0b010 << 5) | (0b011 << 2)]))
+        self.__i2c.writeto_mem(0x74, bytes([(osrs_t << 5) | (osrs_p << 2)]))
         # config (0x75): IIR filter coeff = 8 (011)
         self.__i2c.writeto_mem(0x75, bytes([0b011 << 2]))
+        self.__tph_ms = self.__estimate_tph_time_ms(osrs_t, osrs_p, osrs_h)
 
         # Internal state
+        self.__rx = bytearray(17)  # 0x1D.. field data burst
         self.__temperature_correction = 0
+        self.__rh_correction_needed = False
         self.__t_fine = None
         self.__adc_pres = None
         self.__adc_temp = None
@@ -109,25 +123,31 @@ class BME680:
         self.__adc_gas  = None
         self.__gas_range = None
         
-        self.__last_ctrl_gas1 = 0  # self.__REG_CTRL_GAS1 last value (toggle minimize)
+        self.__last_ctrl_gas1 = 0  # _REG_CTRL_GAS1 last value (toggle minimize)
+        self.__gas_wait_ms = 0     # decoded _REG_GAS_WAIT_0 last value
         
         self.__ready_gas = False
         self.__last_valid_gas = None        
         self.__gas_baseline = 90_000  # 90 kOhm
         self.__gas_baseline_auto_update_ms = 300_000  # 5 minutes
+        self.__iaq_key = None   # iaq() weighting/baseline arguments the cached factors were built from
+        self.__iaq_k = None
+        self.__iaq_last_baseline_update_ms = utime.ticks_ms()
  
-        self.__period_ms = self.__NORM_BASE_PERIOD
+        self.__period_ms = _NORM_BASE_PERIOD
         self.__next_due_ms = utime.ticks_ms()
   
+        self.__rd_buf = [0.0, 0.0, 0.0, None]        # temp, pres, humi, gas
+        self.__iaq_buf = [0, 0.0, 0.0, 0.0, None]    # iaq, temp, pres, humi, gas
+
         self.__tmr = None
         self.__cb = None
-        self.__poll_busy = False
-        self.__scheduled = False
+        self.__cq = bytearray(1)  # samples due but not yet delivered (timer -> __drain)
         self.__is_gas = False
         self.__is_read_callback = True
 
     def __auto_heater_profile(self):
-        new_dur = min(120, max(20, int(120 * self.__period_ms / self.__NORM_BASE_PERIOD)))
+        new_dur = min(120, max(20, int(120 * self.__period_ms / _NORM_BASE_PERIOD)))
         tau = 1500  # ms
         self.__set_run_gas(False)
         self.__perform_reading()
@@ -198,37 +218,51 @@ class BME680:
         self.__is_read_callback = False
         self.__on_read_iaq(callback)
         
-    def read(self, *, wait=True):
+    @micropython.native
+    def read(self, *, wait=True, out=None):
+        set_run_gas = self.__set_run_gas
+        perform = self.__perform_reading
+
         if wait:
+            ticks_add = utime.ticks_add
+            ticks_diff = utime.ticks_diff
+            period = self.__period_ms
             now = utime.ticks_ms()
             due = self.__next_due_ms
-            self.__next_due_ms = utime.ticks_add(self.__next_due_ms, self.__period_ms)
-            delay = utime.ticks_diff(due, now)
+            nxt = ticks_add(due, period)
+            delay = ticks_diff(due, now)
             if delay > 0:
+                self.__next_due_ms = nxt
                 utime.sleep_ms(delay)
             else:
-                while utime.ticks_diff(self.__next_due_ms, now) <= 0:
-                    self.__next_due_ms = utime.ticks_add(self.__next_due_ms, self.__period_ms)
+                while ticks_diff(nxt, now) <= 0:
+                    nxt = ticks_add(nxt, period)
+                self.__next_due_ms = nxt
         
-        self.__set_run_gas(False)
-        self.__perform_reading()
+        set_run_gas(False)
+        perform()
         temp, pres, humi = self.__temperature(), self.__pressure(), self.__humidity()
         
         if not self.__is_gas:
             gas = None
         else:
-            self.__set_run_gas(True)
-            self.__perform_reading()
+            set_run_gas(True)
+            perform()
             gas_ok = self.__ready_gas
-            self.__set_run_gas(False)
+            set_run_gas(False)
             if gas_ok:
                 gas = self.__gas()
                 self.__last_valid_gas = gas
             else:
                 gas = self.__last_valid_gas if (self.__last_valid_gas is not None) else None
-            
-        return temp, pres, humi, gas
+        
+        if out is None:
+            return temp, pres, humi, gas
+        
+        out[0] = temp; out[1] = pres; out[2] = humi; out[3] = gas
+        return out
 
+    @micropython.native
     def iaq(self,
             *,
             temp_weighting=0.08,  
@@ -239,7 +273,8 @@ class BME680:
             temp_baseline=25.0,
             pressure_baseline=1013.25, 
             humi_baseline=50.0,
-            wait=True
+            wait=True,
+            out=None
             ):
         """
         IAQ (0-500): Higher numbers indicate worse conditions.
@@ -252,16 +287,21 @@ class BME680:
         Baseline:
         - In a clean environment only, slowly increase/correct by 2% EMA every 5 minutes
         """
-        total_weighting = temp_weighting + pressure_weighting + humi_weighting + gas_weighting
-        if abs(total_weighting - 1.0) > 0.001:
-            raise ValueError("The sum of weightings must be 1.0 to keep IAQ meaningful.")
+        key = (temp_weighting, pressure_weighting, humi_weighting, gas_weighting, humi_baseline)
+        if key != self.__iaq_key:
+            total_weighting = temp_weighting + pressure_weighting + humi_weighting + gas_weighting
+            if abs(total_weighting - 1.0) > 0.001:
+                raise ValueError("The sum of weightings must be 1.0 to keep IAQ meaningful.")
+            self.__iaq_k = (temp_weighting * 100.0, pressure_weighting * 100.0, humi_weighting * 100.0,
+                            gas_weighting * 100.0, 1.0 / max(humi_baseline * 2.0, 1e-9))
+            self.__iaq_key = key
+        tw100, pw100, hw100, gw100, inv_h_base2 = self.__iaq_k
+
         if not (0.0 < gas_ema_alpha <= 0.2):
             raise ValueError("gas_ema_alpha should be in (0, 0.2].")
-    
-        if "_BME680__iaq_last_baseline_update_ms" not in self.__dict__:
-            self.__iaq_last_baseline_update_ms = utime.ticks_ms()
 
-        temp, pres, humi, gas = self.read(wait=wait)
+        rd = self.read(wait=wait, out=self.__rd_buf)
+        temp = rd[0]; pres = rd[1]; humi = rd[2]; gas = rd[3]
         gas_ok = self.__ready_gas
 
         if gas_ok:
@@ -272,16 +312,20 @@ class BME680:
                 self.__gas_baseline = (1.0 - gas_ema_alpha) * self.__gas_baseline + gas_ema_alpha * gas
                 self.__iaq_last_baseline_update_ms = now
 
-        hum_bad  = min(abs(humi - humi_baseline) / max(humi_baseline * 2.0, 1e-9), 1.0) * (humi_weighting * 100.0)
-        temp_bad = min(abs(temp - temp_baseline) / 10.0, 1.0) * (temp_weighting * 100.0)
-        pres_bad = min(abs(pres - pressure_baseline) / 50.0, 1.0) * (pressure_weighting * 100.0)
+        hum_bad  = min(abs(humi - humi_baseline) * inv_h_base2, 1.0) * hw100
+        temp_bad = min(abs(temp - temp_baseline) / 10.0, 1.0) * tw100
+        pres_bad = min(abs(pres - pressure_baseline) / 50.0, 1.0) * pw100
 
         drop = max((self.__gas_baseline - gas) / max(self.__gas_baseline, 1e-9), 0.0)  # 0..1
         gamma = 0.8
-        gas_bad = min(pow(drop, gamma), 1.0) * (gas_weighting * 100.0)
+        gas_bad = min(math.exp(gamma * math.log(drop)), 1.0) * gw100 if drop > 0.0 else 0.0
 
         iaq = int(min(max(5.0 * (hum_bad + temp_bad + pres_bad + gas_bad), 0.0), 500.0))
-        return iaq, temp, pres, humi, gas
+        if out is None:
+            return iaq, temp, pres, humi, gas
+        
+        out[0] = iaq; out[1] = temp; out[2] = pres; out[3] = humi; out[4] = gas
+        return out
 
 
     def burnIn(self, threshold=0.02, count=8, timeout_sec=1800):
@@ -330,85 +374,97 @@ class BME680:
             self.__perform_reading()
             amb_temp_c = self.__temperature()
 
-        rh = self.__calc_res_heat(target_temp_c, amb_temp_c)
-        gw = self.__encode_gas_wait(duration_ms)
+        rh = self.__calc_res_heat(int(target_temp_c), int(amb_temp_c))
+        gw = self.__encode_gas_wait(int(duration_ms))
 
-        self.__i2c.writeto_mem(0x5A, bytes([rh]))   # res_heat_0
-        self.__i2c.writeto_mem(self.__REG_GAS_WAIT_0, bytes([gw]))   # gas_wait_0
+        tx = self.__tx()
+        tx[0] = rh
+        self.__i2c.writeto_mem(0x5A, tx)                # res_heat_0
+        tx[0] = gw
+        self.__i2c.writeto_mem(_REG_GAS_WAIT_0, tx)     # gas_wait_0
+        self.__gas_wait_ms = self.__decode_gas_wait_ms(gw)
 
     def adjust_temperature_correction(self, delta):
         self.__temperature_correction += float(delta)
+        self.__rh_correction_needed = abs(self.__temperature_correction) > 1e-6
 
     def sealevel(self, altitude):
         self.__perform_reading()
         press = self.__pressure()
-        return press / pow((1 - altitude/44330.0), 5.255), press
+        return press / math.exp(5.255 * math.log(1 - altitude/44330.0)), press
 
     def altitude(self, sealevel):
         self.__perform_reading()
         press = self.__pressure()
-        return 44330.0 * (1.0 - pow(press / sealevel, 1/5.255)), press
+        return 44330.0 * (1.0 - math.exp(math.log(press / sealevel) / 5.255)), press
+
+    def __tx(self):
+        return self.__tx1 if self.__in_drain else self.__tx1_user
 
     def __set_power_mode(self, value):
-        tmp = self.__i2c.readfrom_mem(0x74, 1)[0]
-        tmp &= ~0x03
-        tmp |= (value & 0x03)
-        self.__i2c.writeto_mem(0x74, bytes([tmp]))
+        tx = self.__tx()
+        self.__i2c.readfrom_mem_into(0x74, tx)
+        tx[0] = (tx[0] & ~0x03) | (value & 0x03)
+        self.__i2c.writeto_mem(0x74, tx)
 
     def __decode_gas_wait_ms(self, reg_val: int) -> int:
         factor = (reg_val >> 6) & 0x03
         mant   = reg_val & 0x3F
         return mant * (1 << (2 * factor))
 
-    def __estimate_tph_time_ms(self) -> int:
-        ctrl_meas = self.__i2c.readfrom_mem(0x74, 1)[0]
-        ctrl_hum  = self.__i2c.readfrom_mem(0x72, 1)[0]
-        osrs_t = (ctrl_meas >> 5) & 0x07
-        osrs_p = (ctrl_meas >> 2) & 0x07
-        osrs_h = (ctrl_hum  >> 0) & 0x07
+    def __estimate_tph_time_ms(self, osrs_t: int, osrs_p: int, osrs_h: int) -> int:
         t_ms = 1.25 + (2.3*osrs_t) + (2.3*osrs_p + 0.575) + (2.3*osrs_h + 0.575)
         return int(t_ms + 0.5)
 
+    @micropython.native
+    def __wait_once(self, stale, t_est_ms, margin_ms, extra_margin):
+        ticks_ms = utime.ticks_ms
+        ticks_diff = utime.ticks_diff
+        sleep_us = utime.sleep_us
+        read_mem = self.__i2c.readfrom_mem
+
+        self.__set_power_mode(_FORCED_MODE)
+
+        measured = not stale
+        sleep_us(800)  # measuring=1 is guaranteed within this window
+
+        delay_us = 200
+        deadline = utime.ticks_add(ticks_ms(), t_est_ms + margin_ms + extra_margin)
+        while ticks_diff(deadline, ticks_ms()) > 0:
+            st = read_mem(_REG_STATUS, 1)[0]
+            if st & 0x20:  # measuring=1
+                measured = True
+            elif measured and (st & _BIT_NEW_DATA):  # new_data_0
+                return True
+            sleep_us(delay_us)
+            delay_us = delay_us * 2 if delay_us < 1500 else 3000
+        return False
+
+    @micropython.native
     def __perform_reading(self):
-        if self.__i2c.readfrom_mem(self.__REG_STATUS, 1)[0] & self.__BIT_NEW_DATA:
-            _ = self.__i2c.readfrom_mem(self.__REG_STATUS, 17)
+        # a new_data flag still latched from the previous cycle is not trusted until
+        # the measuring bit of this cycle has been seen (no discard burst needed)
+        stale = (self.__i2c.readfrom_mem(_REG_STATUS, 1)[0] & _BIT_NEW_DATA) != 0
 
-        ctrl_gas1 = self.__i2c.readfrom_mem(self.__REG_CTRL_GAS1, 1)[0]
-        run_gas_enabled = (ctrl_gas1 & (1 << 4)) != 0
-        gas_wait_reg = self.__i2c.readfrom_mem(self.__REG_GAS_WAIT_0, 1)[0]
-        gas_wait_ms = self.__decode_gas_wait_ms(gas_wait_reg) if run_gas_enabled else 0
+        # ctrl_gas1 / gas_wait_0 are only written by this driver, so use the mirrored values
+        run_gas_enabled = (self.__last_ctrl_gas1 & (1 << 4)) != 0
+        gas_wait_ms = self.__gas_wait_ms if run_gas_enabled else 0
 
-        tph_ms = self.__estimate_tph_time_ms()
+        tph_ms = self.__tph_ms
         t_est_ms = tph_ms + gas_wait_ms
         margin_ms = max(60, t_est_ms // 2)
 
-        def _wait_once(extra_margin=0):
-            self.__set_power_mode(self.__FORCED_MODE)
-
-            t0 = utime.ticks_add(utime.ticks_ms(), 5)
-            while utime.ticks_diff(t0, utime.ticks_ms()) > 0:
-                st = self.__i2c.readfrom_mem(self.__REG_STATUS, 1)[0]
-                if st & 0x20:  # measuring=1
-                    break
-
-            deadline = utime.ticks_add(utime.ticks_ms(), t_est_ms + margin_ms + extra_margin)
-            while utime.ticks_diff(deadline, utime.ticks_ms()) > 0:
-                st = self.__i2c.readfrom_mem(self.__REG_STATUS, 1)[0]
-                if st & self.__BIT_NEW_DATA:  # new_data_0
-                    return True
-                utime.sleep_ms(3)
-            return False
-        
-        if not _wait_once():
-            if not _wait_once(extra_margin=margin_ms):
+        if not self.__wait_once(stale, t_est_ms, margin_ms, 0):
+            if not self.__wait_once(stale, t_est_ms, margin_ms, margin_ms):
                 raise OSError(f"BME680 sensor data not ready (tph={tph_ms}ms, gas_wait={gas_wait_ms}ms, est={t_est_ms}ms)")
                 
-        data = self.__i2c.readfrom_mem(self.__REG_STATUS, 17)
+        data = self.__rx
+        self.__i2c.readfrom_mem_into(_REG_STATUS, data)
 
         self.__adc_pres = (data[2] << 12) | (data[3] << 4) | (data[4] >> 4)
         self.__adc_temp = (data[5] << 12) | (data[6] << 4) | (data[7] >> 4)
-        self.__adc_hum = ustruct.unpack(">H", bytes(data[8:10]))[0]
-        self.__adc_gas = (ustruct.unpack(">H", bytes(data[13:15]))[0] >> 6)
+        self.__adc_hum = (data[8] << 8) | data[9]
+        self.__adc_gas = ((data[13] << 8) | data[14]) >> 6
         self.__gas_range = data[14] & 0x0F
 
         var1 = (self.__adc_temp / 8.0) - (self.__par_t1 * 2.0)
@@ -417,72 +473,88 @@ class BME680:
         var3 = (var3 * self.__par_t3 * 16.0) / 16384.0
         self.__t_fine = int(var2 + var3)
          
-        self.__ready_gas = (data[14] & self.__BITS_GAS_OK) == self.__BITS_GAS_OK
-
-    def __es_hPa(self, T_c):
-        # Magnus (over water): hPa
-        return 6.112 * math.exp((17.62 * T_c) / (243.12 + T_c))
+        self.__ready_gas = (data[14] & _BITS_GAS_OK) == _BITS_GAS_OK
 
     def __compensate_rh_for_temp(self, rh_meas, temp):
-        # e = RH_meas/100 * es(T_meas)
+        # Magnus (over water): es(T) = 6.112 * exp(17.62*T / (243.12+T)) hPa
+        # RH_corr = RH_meas * es(T_meas) / es(T_corr), the ratio needs a single exp
         T_meas = temp - self.__temperature_correction
         T_corr = temp
-        e = (max(0.0, min(100.0, rh_meas)) / 100.0) * self.__es_hPa(T_meas)
-        rh_corr = 100.0 * e / self.__es_hPa(T_corr)
+        k = (17.62 * T_meas) / (243.12 + T_meas) - (17.62 * T_corr) / (243.12 + T_corr)
+        rh_corr = max(0.0, min(100.0, rh_meas)) * math.exp(k)
         rh_corr = 0.0 if rh_corr < 0.0 else 100.0 if rh_corr > 100.0 else rh_corr
         return rh_corr
 
+    @micropython.native
     def __temperature(self):
         return ((((self.__t_fine * 5) + 128) / 256.0) / 100.0) + self.__temperature_correction
 
     def __pressure(self):
+        return self.__pressure_pa() / 100.0  # hPa
+
+    @micropython.viper
+    def __pressure_pa(self) -> int:
+        # Bosch integer compensation, result in Pa
         p = self.__pressure_calibration
-        var1 = (self.__t_fine / 2.0) - 64000.0
-        var2 = ((var1 / 4.0) * (var1 / 4.0)) / 2048.0
-        var2 = (var2 * p[5]) / 4.0
-        var2 = var2 + (var1 * p[4] * 2.0)
-        var2 = (var2 / 4.0) + (p[3] * 65536.0)
-        var1 = ((((var1 / 4.0) * (var1 / 4.0)) / 8192.0) * (p[2] * 32.0) / 8.0) + ((p[1] * var1) / 2.0)
-        var1 = var1 / 262144.0
-        var1 = ((32768.0 + var1) * p[0]) / 32768.0
-        calc_pres = 1048576.0 - self.__adc_pres
-        calc_pres = (calc_pres - (var2 / 4096.0)) * 3125.0
-        calc_pres = (calc_pres / var1) * 2.0
-        var1 = (p[8] * (((calc_pres / 8.0) * (calc_pres / 8.0)) / 8192.0)) / 4096.0
-        var2 = ((calc_pres / 4.0) * p[7]) / 8192.0
-        var3 = (((calc_pres / 256.0) ** 3) * p[9]) / 131072.0
-        calc_pres += (var1 + var2 + var3 + (p[6] * 128.0)) / 16.0
-        return calc_pres / 100.0  # hPa
+        p1 = int(p[0]); p2 = int(p[1]); p3 = int(p[2]); p4 = int(p[3]); p5 = int(p[4])
+        p6 = int(p[5]); p7 = int(p[6]); p8 = int(p[7]); p9 = int(p[8]); p10 = int(p[9])
+        adc = int(self.__adc_pres)
+
+        var1 = (int(self.__t_fine) >> 1) - 64000
+        var2 = ((((var1 >> 2) * (var1 >> 2)) >> 11) * p6) >> 2
+        var2 = var2 + ((var1 * p5) << 1)
+        var2 = (var2 >> 2) + (p4 << 16)
+        var1 = (((((var1 >> 2) * (var1 >> 2)) >> 13) * (p3 << 5)) >> 3) + ((p2 * var1) >> 1)
+        var1 = var1 >> 18
+        var1 = ((32768 + var1) * p1) >> 15
+        if var1 == 0:
+            return 0
+
+        calc_pres = 1048576 - adc
+        calc_pres = (calc_pres - (var2 >> 12)) * 3125
+        if calc_pres > 0x3FFFFFFF:  # 1 << 30 is not a small int; keep the literal in range
+            calc_pres = (calc_pres // var1) << 1
+        else:
+            calc_pres = (calc_pres << 1) // var1
+
+        var1 = (p9 * (((calc_pres >> 3) * (calc_pres >> 3)) >> 13)) >> 12
+        var2 = ((calc_pres >> 2) * p8) >> 13
+        var3 = ((calc_pres >> 8) * (calc_pres >> 8) * (calc_pres >> 8) * p10) >> 17
+        return calc_pres + ((var1 + var2 + var3 + (p7 << 7)) >> 4)
 
     def __humidity(self):
-        h = self.__humidity_calibration
-        temp_scaled = ((self.__t_fine * 5.0) + 128.0) / 256.0
-        var1 = (self.__adc_hum - (h[0] * 16.0)) - ((temp_scaled * h[2]) / 200.0)
-        var2 = (h[1] * (((temp_scaled * h[3]) / 100.0) + (((temp_scaled * ((temp_scaled * h[4]) / 100.0)) / 64.0) / 100.0) + 16384.0)) / 1024.0
-        var3 = var1 * var2
-        var4 = (h[5] * 128.0 + ((temp_scaled * h[6]) / 100.0)) / 16.0
-        var5 = ((var3 / 16384.0) * (var3 / 16384.0)) / 1024.0
-        var6 = (var4 * var5) / 2.0
-        calc_hum = ((((var3 + var6) / 1024.0) * 1000.0) / 4096.0) / 1000.0
+        calc_hum = self.__humidity_milli() / 1000.0
         
-        if abs(self.__temperature_correction) > 1e-6:
+        if self.__rh_correction_needed:
             calc_hum = self.__compensate_rh_for_temp(calc_hum, self.__temperature())
         
         return 100.0 if calc_hum > 100.0 else 0.0 if calc_hum < 0.0 else calc_hum
 
+    @micropython.viper
+    def __humidity_milli(self) -> int:
+        # Bosch integer compensation, result in 1/1000 %RH
+        h = self.__humidity_calibration
+        h1 = int(h[0]); h2 = int(h[1]); h3 = int(h[2]); h4 = int(h[3])
+        h5 = int(h[4]); h6 = int(h[5]); h7 = int(h[6])
+        adc = int(self.__adc_hum)
+
+        temp_scaled = ((int(self.__t_fine) * 5) + 128) >> 8
+        var1 = (adc - (h1 * 16)) - (((temp_scaled * h3) // 100) >> 1)
+        var2 = (h2 * (((temp_scaled * h4) // 100) + (((temp_scaled * ((temp_scaled * h5) // 100)) >> 6) // 100) + (1 << 14))) >> 10
+        var3 = var1 * var2
+        var4 = ((h6 << 7) + ((temp_scaled * h7) // 100)) >> 4
+        var5 = ((var3 >> 14) * (var3 >> 14)) >> 10
+        var6 = (var4 * var5) >> 1
+        calc_hum = (((var3 + var6) >> 10) * 1000) >> 12
+        return 100000 if calc_hum > 100000 else 0 if calc_hum < 0 else calc_hum
+
+    @micropython.native
     def __gas(self):
         adc = int(self.__adc_gas)                 # 10-bit
         gr  = int(self.__gas_range) & 0x0F        # 0..15
         rs_err = int(self.__sw_err)
 
-        lookup = (
-            2147483647, 2147483647, 2147483647, 2147483647,
-            2147483647, 2126008810, 2147483647, 2130303777,
-            2147483647, 2147483647, 2143188679, 2136746228,
-            2147483647, 2126008810, 2147483647, 2147483647
-        )
-
-        var1 = ((1340 + (5 * rs_err)) * lookup[gr]) >> 16
+        var1 = ((1340 + (5 * rs_err)) * _GAS_LOOKUP[gr]) >> 16
         var2 = ((adc << 15) - 16777216) + var1
         var3 = ((125000 << (15 - gr)) * var1) >> 9
         var3 += (var2 >> 1)
@@ -490,39 +562,34 @@ class BME680:
         return float(gas_res_ohm)
 
     def __set_run_gas(self, enable: bool):
-        val = (1 << 4) | 0 if enable else 0  # run_gas=[4], nb_conv=0
+        val = _CTRL_GAS1_VALS[1 if enable else 0]
         if val != self.__last_ctrl_gas1:
-            self.__i2c.writeto_mem(self.__REG_CTRL_GAS1, bytes([val]))
+            tx = self.__tx()
+            tx[0] = val
+            self.__i2c.writeto_mem(_REG_CTRL_GAS1, tx)
             self.__last_ctrl_gas1 = val
 
-    def __calc_res_heat(self, target_temp_c: int, amb_temp_c: float) -> int:
-        t = min(int(target_temp_c), 400)   # 400°C cap
-
-        gh1 = float(self.__par_gh1)
-        gh2 = float(self.__par_gh2)
-        gh3 = float(self.__par_gh3)
-        htr = float(self.__res_heat_range)   # 0..3
-        htv = float(self.__res_heat_val)     # -128..127
+    @micropython.viper
+    def __calc_res_heat(self, target_temp_c: int, amb_temp_c: int) -> int:
+        # Bosch integer heater resistance, result is the res_heat_x register value
+        t = target_temp_c if target_temp_c < 400 else 400   # 400°C cap
 
-        var1 = (gh1 / 16.0) + 49.0
-        var2 = (gh2 / 32768.0) * 0.0005 + 0.00235
-        var3 = gh3 / 1024.0
-        var4 = var1 * (1.0 + var2 * float(t))
-        var5 = var4 + (var3 * float(amb_temp_c))
-
-        res_heat = int(3.4 * ((var5 * (4.0 / (4.0 + htr)) * (1.0 / (1.0 + (htv * 0.002)))) - 25.0))
-        return max(0, min(res_heat, 255))
+        var1 = ((amb_temp_c * int(self.__rh_gh3)) // 1000) * 256
+        var2 = int(self.__rh_gh1) * ((((int(self.__rh_gh2) * t * 5) // 100) + 3276800) // 10)
+        var3 = var1 + (var2 // 2)
+        var4 = var3 // int(self.__rh_div)
+        res_heat = ((((var4 // int(self.__rh_var5)) - 250) * 34) + 50) // 100
+        return 0 if res_heat < 0 else 255 if res_heat > 255 else res_heat
 
+    @micropython.viper
     def __encode_gas_wait(self, ms: int) -> int:
-        """gas_wait_x(self.__REG_GAS_WAIT_0..) encoding (1..4032ms, 0xFF=max)"""
-        dur = int(ms)
-        if dur >= 0xFC0:  # >= 4032 ms
+        """gas_wait_x(_REG_GAS_WAIT_0..) encoding (1..4032ms, 0xFF=max)"""
+        if ms < 1:
+            return 0
+        if ms >= 0xFC0:  # >= 4032 ms
             return 0xFF
-        factor = 0
-        while dur > 0x3F and factor < 3:
-            dur //= 4
-            factor += 1
-        return int(dur + (factor << 6))
+        factor = 3 if ms > 0x3FF else 2 if ms > 0xFF else 1 if ms > 0x3F else 0
+        return (ms >> (factor << 1)) | (factor << 6)
 
     def __on_read_iaq(self, callback):
         if self.__tmr:
@@ -533,7 +600,7 @@ class BME680:
             self.__tmr = None
 
         self.__cb = callback
-        self.__scheduled = False
+        self.__cq[0] = 0
 
         if callback is None:
             return
@@ -542,26 +609,41 @@ class BME680:
         self.__tmr.init(period=self.__period_ms, mode=machine.Timer.PERIODIC, callback=self.__tmr_isr)
 
     def __tmr_isr(self, _):
-        if self.__scheduled:
+        cq = self.__cq
+        n = cq[0]
+        if n >= _CQ_MAX:
             return
         
-        self.__scheduled = True
-        try:
-            micropython.schedule(self.__poll_sched, 0)
-        except Exception:
-            self.__scheduled = False
+        cq[0] = n + 1
+        if n == 0:
+            try:
+                micropython.schedule(self.__drain, 0)
+            except Exception:
+                cq[0] = 0
 
-    def __poll_sched(self, _):
-        self.__scheduled = False
-        if self.__poll_busy:
-            return
-        
-        self.__poll_busy = True
+    def __drain(self, _):
+        cq = self.__cq
+        self.__in_drain = True
         try:
-            if self.__is_read_callback:
-                self.__cb(*self.read(wait=False))
-            else:
-                self.__cb(*self.iaq(wait=False))
+            while cq[0] > 0:
+                cb = self.__cb
+                if cb is None:
+                    cq[0] = 0
+                    break
+                
+                if self.__is_read_callback:
+                    out = self.read(wait=False, out=self.__rd_buf)
+                    cb(out[0], out[1], out[2], out[3])
+                else:
+                    out = self.iaq(wait=False, out=self.__iaq_buf)
+                    cb(out[0], out[1], out[2], out[3], out[4])
+                
+                state = machine.disable_irq()
+                if cq[0] > 0:
+                    cq[0] -= 1
+                machine.enable_irq(state)
+        except Exception:
+            cq[0] = 0  # let the next timer tick schedule a fresh drain
+            raise
         finally:
-
-            self.__poll_busy = False
+            self.__in_drain = False
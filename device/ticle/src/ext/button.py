@@ -2,10 +2,128 @@ __version__ = "1.0.0"
 __author__ = "PlanX Lab Development Team"
 
 from . import (
-    utime,
+    sys, utime, array,
     machine, micropython,
     ticle
 )
+from micropython import const
+
+_ticks_ms = utime.ticks_ms
+_ticks_diff = utime.ticks_diff
+_ticks_add = utime.ticks_add
+_schedule = micropython.schedule
+
+# Event codes (same values as Button.CLICKED .. Button.RELEASED)
+_EV_CLICKED = const(1)
+_EV_DOUBLE_CLICKED = const(2)
+_EV_LONG_PRESSED = const(3)
+_EV_PRESSED = const(4)
+_EV_RELEASED = const(5)
+
+# Deferred event queue: edge/timer paths push, one scheduled drain runs callbacks
+_RING_SIZE = const(32)  # power of two
+_RING_MASK = const(31)
+
+# Per-pin click state machine
+_ST_IDLE = const(0)         # released
+_ST_PRESSED = const(1)      # first press in progress
+_ST_WAIT_DBL = const(2)     # released after a click, waiting for the second one
+_ST_PRESSED_DBL = const(3)  # second press in progress
+
+_ACT_NONE = const(0)
+_ACT_PRESS = const(1)
+_ACT_RELEASE = const(2)
+
+# Pending deadline per pin (at most one outstanding at a time)
+_TMR_NONE = const(0)
+_TMR_LONG = const(1)  # long-press threshold
+_TMR_DBL = const(2)   # double-click window
+_TMR_SETTLE = const(3)  # re-read the level after an edge rejected as bounce
+_TMR_DRAIN = const(4)   # retry scheduling the drain after micropython.schedule was full
+
+# Setter limits: debounce_ms is stored as 'H'; the timeouts go through ticks_add,
+# which only accepts deltas below half the 2**30 tick period
+_DEBOUNCE_MAX_MS = const(0xFFFF)
+_TIMEOUT_MAX_MS = const(0x1FFFFFFF)
+
+# Indexed by (state << 1) | pressed. Pressed states are the odd ones.
+_FSM_NEXT = bytes((
+    _ST_IDLE,        _ST_PRESSED,      # IDLE
+    _ST_IDLE,        _ST_PRESSED,      # PRESSED
+    _ST_WAIT_DBL,    _ST_PRESSED_DBL,  # WAIT_DBL
+    _ST_IDLE,        _ST_PRESSED_DBL,  # PRESSED_DBL
+))
+_FSM_ACT = bytes((
+    _ACT_NONE,       _ACT_PRESS,
+    _ACT_RELEASE,    _ACT_NONE,
+    _ACT_NONE,       _ACT_PRESS,
+    _ACT_RELEASE,    _ACT_NONE,
+))
+
+
+@micropython.viper
+def _gpio_snapshot(pins: ptr8, n: int, out: ptr8):
+    # RP2350 SIO: GPIO_IN (GPIO0-31) at 0xd0000004, GPIO_HI_IN (GPIO32-47) right after
+    sio = ptr32((0xD000 << 16) | 0x004)
+    lo = sio[0]
+    hi = sio[1]
+    for i in range(n):
+        p = pins[i]
+        if p < 32:
+            out[i] = (lo >> p) & 1
+        else:
+            out[i] = (hi >> (p - 32)) & 1
+
+
+@micropython.viper
+def _earliest_slot(kinds: ptr8, deadline: ptr32, n: int) -> int:
+    # Index of the pending slot (kind != 0) that expires first, or -1.
+    # Deadlines are ticks_ms values, compared modulo the 2**30 tick period.
+    best = -1
+    best_due = 0
+    for i in range(n):
+        if kinds[i] != 0:
+            due = deadline[i]
+            if best < 0 or ((due - best_due + 0x20000000) & 0x3FFFFFFF) < 0x20000000:
+                best = i
+                best_due = due
+    return best
+
+
+@micropython.viper
+def _click_scan(sel: ptr8, m: int, cur: ptr8, last: ptr8, invert: ptr8, latch: ptr8, out: ptr8):
+    # out[k] = 1 if pin sel[k] was latched by an edge or has gone inactive -> active since last poll
+    for k in range(m):
+        i = sel[k]
+        c = cur[i]
+        inv = invert[i]
+        hit = 0
+        if latch[i] != 0:
+            hit = 1
+        elif ((last[i] ^ inv) == 0) and ((c ^ inv) == 1):
+            hit = 1
+        out[k] = hit
+        latch[i] = 0
+        last[i] = c
+
+
+_CB_EVENTS = {
+    'on_clicked': _EV_CLICKED,
+    'on_double_clicked': _EV_DOUBLE_CLICKED,
+    'on_long_pressed': _EV_LONG_PRESSED,
+    'on_pressed': _EV_PRESSED,
+    'on_released': _EV_RELEASED,
+}
+
+def _callback_property(ev: int) -> property:
+    # Shared get/set pair for the five on_* view properties, keyed by event code
+    def _get(view) -> tuple:
+        return Button._get_on_list(view._parent, ev, view._indices)
+
+    def _set(view, callback: callable):
+        Button._set_on_all(view._parent, ev, callback, view._indices)
+
+    return property(_get, _set)
 
 
 class Button:
@@ -23,23 +141,36 @@ class Button:
             raise ValueError("At least one pin must be provided")
             
         self._pins = list(pins)
+        self._pins_tuple = tuple(self._pins)
+        self._pin_to_idx = {p: i for i, p in enumerate(self._pins)}
         n = len(self._pins)
+        self._all_indices = tuple(range(n))  # shared by whole-object views (btn[:])
+        self._all_sel = bytes(self._all_indices)
         
         self._din = ticle.Din(self._pins)
         
-        self._debounce_ms = [20] * n              # Minimum press time for click (debounce)
-        self._double_click_window_ms = [300] * n  # Time window for second click
-        self._long_press_threshold_ms = [800] * n # Long press threshold
+        self._debounce_ms = array.array('H', [20] * n) # Minimum press time for click (debounce)
+        self._double_click_window_ms = array.array('I', [300] * n)  # Time window for second click
+        self._long_press_threshold_ms = array.array('I', [800] * n) # Long press threshold
+        self._double_click_window_uniform = 300     # Shared window value, -1 once mixed
+        self._long_press_threshold_uniform = 800    # Shared threshold value, -1 once mixed
         
-        self._active_type = [Button.ACTIVE_HIGH] * n
-        self._last = [0] * n
-        self._click_latch = [0] * n
+        # Hot per-pin state: one byte (flags) or one word (ticks) per pin
+        self._invert = bytearray(n)  # 0 = ACTIVE_HIGH, 1 = ACTIVE_LOW (level ^ invert = pressed)
+        self._pull_applied = bytearray(n)  # pull for the current active type has been set on the Din
+        self._last = bytearray(n)
+        self._levels = bytearray(n)  # scratch for _raw_read_all
+        self._pin_bytes = bytes(self._pins)
+        self._click_latch = bytearray(n)
         
-        self._current_state = [False] * n    # Current button state (active/inactive)
-        self._press_start_time = [0] * n     # When button was pressed
-        self._last_release_time = [0] * n    # When button was last released
-        self._waiting_for_double = [False] * n # Waiting for second click
-        self._long_press_fired = [False] * n   # Long press already fired
+        self._fsm_state = bytearray(n)           # _ST_* per pin
+        self._pressed = bytearray(n)             # Debounced pressed level
+        # Seeded further back than any debounce_ms ('H', < 2**16) so the first edges pass
+        long_ago = _ticks_add(_ticks_ms(), -0x10000)
+        self._press_start_time = array.array('i', [long_ago] * n)  # When button was pressed
+        self._last_release_time = array.array('i', [long_ago] * n) # When button was last released
+        self._long_press_fired = bytearray(n)    # Long press already fired
+        self._dbl_deadline = array.array('i', [0] * n)      # End of the double-click window
         
         self._on_clicked = [None] * n
         self._on_double_clicked = [None] * n
@@ -47,9 +178,34 @@ class Button:
         self._on_pressed = [None] * n
         self._on_released = [None] * n
         
-        self._measurement_enabled = [False] * n
+        self._callbacks = (None, self._on_clicked, self._on_double_clicked,
+                           self._on_long_pressed, self._on_pressed, self._on_released)
+        self._has_cb = bytearray(n)  # 1 if any on_* callback is set for the pin
+        
+        self._ring = array.array('H', [0] * _RING_SIZE)  # (pin_idx << 3) | event
+        self._ring_head = 0
+        self._ring_tail = 0
+        self._drain_pending = False
+        self._drain_cb = self._drain
+        self._dropped = array.array('I', [0] * n)  # events lost to a full queue
+        
+        self._measurement_enabled = bytearray(n)
+        
+        # One shared one-shot timer serves every pin's pending deadline.
+        # Slots 0..n-1 hold the FSM deadline, slots n..2n-1 the bounce settle check,
+        # and slot 2n the drain retry.
+        self._settle_base = n
+        self._drain_slot = 2 * n
+        self._deadline = array.array('i', [0] * (2 * n + 1))
+        self._deadline_kind = bytearray(2 * n + 1)  # _TMR_* per slot
+        self._timer = machine.Timer()
+        self._timer_armed = False
+        self._timer_due = 0
+        self._timer_cb = self._on_timer
         
-        self._timers = [None] * n
+        # Views are stateless, so the common whole-object and single-pin ones are shared
+        self._view_all = Button._ButtonView(self, self._all_indices)
+        self._views_single = [Button._ButtonView(self, (i,)) for i in range(n)]
         
         self._din[:].callback = self._button_interrupt_handler
         self._din[:].edge = ticle.Din.CB_FALLING | ticle.Din.CB_RISING
@@ -58,13 +214,11 @@ class Button:
     def deinit(self) -> None:
         try:
             for i in range(len(self._pins)):
-                self._measurement_enabled[i] = False
-                if self._timers[i] is not None:
-                    try:
-                        self._timers[i].deinit()
-                        self._timers[i] = None
-                    except:
-                        pass
+                self._measurement_enabled[i] = 0
+            for i in range(len(self._deadline_kind)):
+                self._deadline_kind[i] = _TMR_NONE
+            self._timer_armed = False
+            self._timer.deinit()
             
             self._din.deinit()            
         except:
@@ -72,329 +226,436 @@ class Button:
 
     def __getitem__(self, idx: int | slice) -> "_ButtonView":
         if isinstance(idx, slice):
-            indices = list(range(*idx.indices(len(self._pins))))
-            return Button._ButtonView(self, indices)
+            n = len(self._pins)
+            start, stop, step = idx.indices(n)
+            if start == 0 and stop == n and step == 1:
+                return self._view_all
+            return Button._ButtonView(self, tuple(range(start, stop, step)))
         elif isinstance(idx, int):
             if not (0 <= idx < len(self._pins)):
                 raise IndexError("Button index out of range")
-            return Button._ButtonView(self, [idx])
+            return self._views_single[idx]
         else:
             raise TypeError("Index must be int or slice")
 
     def __len__(self) -> int:
         return len(self._pins)
 
+    @micropython.native
     def _button_interrupt_handler(self, pin_num: int, rising: bool) -> None:
-        try:
-            pin_idx = self._pins.index(pin_num)
-            
-            if not self._measurement_enabled[pin_idx]:
-                return
-                
-            current_time = utime.ticks_ms()
-            active_type = self._active_type[pin_idx]
-            
-            if active_type == Button.ACTIVE_HIGH:
-                button_active = rising  # button pressed for active-high
-            else:  # ACTIVE_LOW
-                button_active = not rising  #button pressed for active-low
-            
-            if button_active:
-                self._click_latch[pin_idx] = 1
-                self._handle_button_press(pin_idx, current_time)
-            else:
-                self._handle_button_release(pin_idx, current_time)
-                
-        except (ValueError, IndexError):
-            pass
-
-    def _handle_button_press(self, pin_idx: int, current_time: int) -> None:
-        self._current_state[pin_idx] = True
-        self._press_start_time[pin_idx] = current_time
-        self._long_press_fired[pin_idx] = False
+        pin_idx = self._pin_to_idx.get(pin_num)
+        if pin_idx is None:
+            return
         
-        if self._on_pressed[pin_idx]:
-            try:
-                micropython.schedule(
-                    lambda _: self._on_pressed[pin_idx](self._pins[pin_idx]), 0
-                )
-            except RuntimeError:
-                try:
-                    self._on_pressed[pin_idx](self._pins[pin_idx])
-                except:
-                    pass
+        if not self._measurement_enabled[pin_idx]:
+            return
+            
+        button_active = rising ^ self._invert[pin_idx]
+        pressed = self._pressed
+        if button_active == pressed[pin_idx]:
+            return  # partner of an edge already discarded as bounce
         
-        self._setup_long_press_timer(pin_idx)
+        # Presses register immediately; an edge is bounce when it comes less
+        # than debounce_ms after the opposite accepted edge. A negative diff means
+        # that edge is older than half the ticks period, so it cannot be bounce.
+        current_time = _ticks_ms()
+        if button_active:
+            since = _ticks_diff(current_time, self._last_release_time[pin_idx])
+        else:
+            since = _ticks_diff(current_time, self._press_start_time[pin_idx])
+        debounce = self._debounce_ms[pin_idx]
+        if 0 <= since < debounce:
+            # The bounce may have been the real edge; re-read once the window ends
+            self._set_deadline(self._settle_base + pin_idx, _TMR_SETTLE, debounce - since)
+            return
+        self._accept_edge(pin_idx, button_active, current_time)
 
-    def _handle_button_release(self, pin_idx: int, current_time: int) -> None:
-        if not self._current_state[pin_idx]:
-            return 
-            
-        self._current_state[pin_idx] = False
-        press_duration = utime.ticks_diff(current_time, self._press_start_time[pin_idx])
+    @micropython.native
+    def _accept_edge(self, pin_idx: int, button_active: int, current_time: int) -> None:
+        if button_active:
+            self._press_start_time[pin_idx] = current_time
+            self._click_latch[pin_idx] = 1
+        else:
+            self._last_release_time[pin_idx] = current_time
+        self._pressed[pin_idx] = button_active
         
-        self._cancel_timer(pin_idx)
+        if not self._has_cb[pin_idx]:
+            return  # polling only: no state machine or timers needed
         
-        if self._on_released[pin_idx]:
-            try:
-                micropython.schedule(
-                    lambda _: self._on_released[pin_idx](self._pins[pin_idx]), 0
-                )
-            except RuntimeError:
-                try:
-                    self._on_released[pin_idx](self._pins[pin_idx])
-                except:
-                    pass
+        fsm_state = self._fsm_state
+        state = fsm_state[pin_idx]
+        if state == _ST_WAIT_DBL and _ticks_diff(current_time, self._dbl_deadline[pin_idx]) >= 0:
+            # Window already over (timer not armed or not run yet): settle the single click first
+            self._expire_double_click(pin_idx)
+            state = _ST_IDLE
+        event = (state << 1) | button_active
+        fsm_state[pin_idx] = _FSM_NEXT[event]
         
-        if self._long_press_fired[pin_idx]:
-            return
+        action = _FSM_ACT[event]
+        if action == _ACT_PRESS:
+            self._long_press_fired[pin_idx] = 0
+            self._emit(_EV_PRESSED, pin_idx)
+            self._set_deadline(pin_idx, _TMR_LONG, self._long_press_threshold_ms[pin_idx])
         
-        min_press = self._debounce_ms[pin_idx]
-        long_press_threshold = self._long_press_threshold_ms[pin_idx]
+        elif action == _ACT_RELEASE:
+            self._cancel_timer(pin_idx)
+            self._emit(_EV_RELEASED, pin_idx)
+            
+            if self._long_press_fired[pin_idx]:
+                return
+            
+            press_duration = _ticks_diff(current_time, self._press_start_time[pin_idx])
+            if press_duration >= self._long_press_threshold_ms[pin_idx]:
+                return
+            
+            if state == _ST_PRESSED_DBL:
+                # Second click detected - fire double click
+                self._emit(_EV_DOUBLE_CLICKED, pin_idx)
+            else:
+                fsm_state[pin_idx] = _ST_WAIT_DBL
+                window = self._double_click_window_ms[pin_idx]
+                self._dbl_deadline[pin_idx] = _ticks_add(current_time, window)
+                if self._on_clicked[pin_idx] is not None:
+                    # Only a pending single click needs the timer; otherwise
+                    # the window is settled lazily on the next press.
+                    self._set_deadline(pin_idx, _TMR_DBL, window)
+
+    @micropython.native
+    def _emit(self, event: int, pin_idx: int) -> None:
+        if self._callbacks[event][pin_idx] is None:
+            return
         
-        if min_press <= press_duration < long_press_threshold:
-            self._process_click(pin_idx, current_time)
+        tail = self._ring_tail
+        nxt = (tail + 1) & _RING_MASK
+        if nxt == self._ring_head:
+            self._dropped[pin_idx] += 1  # queue full: drop the event
+            return
+        self._ring[tail] = (pin_idx << 3) | event
+        self._ring_tail = nxt
         
-        self._last_release_time[pin_idx] = current_time
+        if not self._drain_pending:
+            self._schedule_drain()
 
-    def _process_click(self, pin_idx: int, current_time: int) -> None:
-        if self._waiting_for_double[pin_idx]:
-            # Second click detected - fire double click
-            self._waiting_for_double[pin_idx] = False
-            self._cancel_timer(pin_idx)
+    def _schedule_drain(self) -> None:
+        try:
+            _schedule(self._drain_cb, 0)
+            self._drain_pending = True
+        except RuntimeError:
+            # Scheduler queue full: retry from the timer instead of waiting for the next event
+            self._set_deadline(self._drain_slot, _TMR_DRAIN, 1)
+
+    def _drain(self, _) -> None:
+        callbacks = self._callbacks
+        pins = self._pins_tuple
+        ring = self._ring
+        
+        # Only run what was queued on entry; later pushes wait for the next pass
+        end = self._ring_tail
+        head = self._ring_head
+        while head != end:
+            entry = ring[head]
+            event = entry & 7
+            pin_idx = entry >> 3
+            head = (head + 1) & _RING_MASK
+            self._ring_head = head
             
-            if self._on_double_clicked[pin_idx]:
+            cb = callbacks[event][pin_idx]
+            if cb:
                 try:
-                    micropython.schedule(
-                        lambda _: self._on_double_clicked[pin_idx](self._pins[pin_idx]), 0
-                    )
-                except RuntimeError:
-                    try:
-                        self._on_double_clicked[pin_idx](self._pins[pin_idx])
-                    except:
-                        pass
+                    cb(pins[pin_idx])
+                except Exception as e:
+                    sys.print_exception(e)
+        
+        self._drain_pending = False
+        if head != self._ring_tail:
+            self._schedule_drain()
+
+    @micropython.native
+    def _set_deadline(self, slot: int, kind: int, ms: int) -> None:
+        now = _ticks_ms()
+        due = _ticks_add(now, ms)
+        self._deadline[slot] = due
+        self._deadline_kind[slot] = kind
+        if not self._timer_armed or _ticks_diff(self._timer_due, now) <= 0:
+            # Idle, or the last fire never arrived: arm for the earliest pending slot
+            self._rearm_timer()
+        elif _ticks_diff(due, self._timer_due) < 0:
+            self._arm_timer(due)
+
+    def _cancel_timer(self, pin_idx: int) -> None:
+        # Lazy cancel: the timer is left running; if it fires with nothing
+        # expired, _on_timer just re-arms for the next pending slot.
+        self._deadline_kind[pin_idx] = _TMR_NONE
+        if self._timer_armed and _ticks_diff(self._timer_due, _ticks_ms()) <= 0:
+            # The fire that should serve the other slots never came
+            self._rearm_timer()
+
+    def _rearm_timer(self) -> None:
+        kinds = self._deadline_kind
+        i = _earliest_slot(kinds, self._deadline, len(kinds))
+        if i >= 0:
+            self._arm_timer(self._deadline[i])
         else:
-            self._waiting_for_double[pin_idx] = True
-            self._setup_double_click_timer(pin_idx)
-
-    def _setup_long_press_timer(self, pin_idx: int) -> None:
-        def long_press_callback(timer):
-            try:
-                if self._current_state[pin_idx]:  # Still pressed
-                    self._long_press_fired[pin_idx] = True
-                    if self._on_long_pressed[pin_idx]:
-                        try:
-                            micropython.schedule(
-                                lambda _: self._on_long_pressed[pin_idx](self._pins[pin_idx]), 0
-                            )
-                        except RuntimeError:
-                            try:
-                                self._on_long_pressed[pin_idx](self._pins[pin_idx])
-                            except:
-                                pass
-            except:
-                pass
-                    
-        try:
-            self._cancel_timer(pin_idx)
-            self._timers[pin_idx] = machine.Timer()
-            self._timers[pin_idx].init(
-                period=self._long_press_threshold_ms[pin_idx],
-                mode=machine.Timer.ONE_SHOT,
-                callback=long_press_callback
-            )
-        except:
-            pass
+            # Only lazily cancelled slots were left; a stray fire finds nothing to do
+            self._timer_armed = False
 
-    def _setup_double_click_timer(self, pin_idx: int) -> None:
-        def double_click_timeout(timer):
-            try:
-                self._waiting_for_double[pin_idx] = False
-                if self._on_clicked[pin_idx]:
-                    try:
-                        micropython.schedule(
-                            lambda _: self._on_clicked[pin_idx](self._pins[pin_idx]), 0
-                        )
-                    except RuntimeError:
-                        try:
-                            self._on_clicked[pin_idx](self._pins[pin_idx])
-                        except:
-                            pass
-            except:
-                pass
-        
+    def _arm_timer(self, due: int) -> None:
         try:
-            self._cancel_timer(pin_idx)
-            self._timers[pin_idx] = machine.Timer()
-            self._timers[pin_idx].init(
-                period=self._double_click_window_ms[pin_idx],
+            self._timer.init(
+                period=max(1, _ticks_diff(due, _ticks_ms())),
                 mode=machine.Timer.ONE_SHOT,
-                callback=double_click_timeout
+                callback=self._timer_cb
             )
-        except:
-            pass
+        except Exception as e:
+            # Stay unarmed so the next _set_deadline tries again
+            sys.print_exception(e)
+            return
+        self._timer_due = due
+        self._timer_armed = True
+
+    @micropython.native
+    def _on_timer(self, timer) -> None:
+        self._timer_armed = False
+        now = _ticks_ms()
+        kinds = self._deadline_kind
+        deadline = self._deadline
+        fsm_state = self._fsm_state
+        
+        for i in range(len(kinds)):
+            kind = kinds[i]
+            if not kind or _ticks_diff(deadline[i], now) > 0:
+                continue
+            kinds[i] = _TMR_NONE
+            
+            if kind == _TMR_SETTLE:
+                # Debounce window over: adopt the pin's actual level if an edge was lost
+                pin_idx = i - self._settle_base
+                if self._measurement_enabled[pin_idx]:
+                    level = self._raw_read(pin_idx) ^ self._invert[pin_idx]
+                    if level != self._pressed[pin_idx]:
+                        self._accept_edge(pin_idx, level, now)
+            elif kind == _TMR_DRAIN:
+                if not self._drain_pending and self._ring_head != self._ring_tail:
+                    self._schedule_drain()
+            elif kind == _TMR_LONG:
+                if not fsm_state[i] & 1:
+                    continue
+                if self._raw_read(i) ^ self._invert[i]:  # Still pressed
+                    self._long_press_fired[i] = 1
+                    self._emit(_EV_LONG_PRESSED, i)
+                else:
+                    # The release came within debounce_ms and was taken for bounce
+                    self._pressed[i] = 0
+                    self._last_release_time[i] = now
+                    fsm_state[i] = _ST_IDLE
+                    self._emit(_EV_RELEASED, i)
+            elif fsm_state[i] == _ST_WAIT_DBL:
+                self._expire_double_click(i)
+        
+        self._rearm_timer()
 
-    def _cancel_timer(self, pin_idx: int) -> None:
-        if self._timers[pin_idx] is not None:
-            try:
-                self._timers[pin_idx].deinit()
-                self._timers[pin_idx] = None
-            except:
-                pass
+    @micropython.native
+    def _expire_double_click(self, pin_idx: int) -> None:
+        self._deadline_kind[pin_idx] = _TMR_NONE
+        self._fsm_state[pin_idx] = _ST_IDLE
+        self._emit(_EV_CLICKED, pin_idx)
 
     def _raw_read(self, idx: int) -> int:
-        try:
-            return 1 if self._din.pins[idx].value() else 0
-        except Exception:
-            vlist = self._din[idx].value
-            v = vlist[0] if isinstance(vlist, (list, tuple)) else vlist
-            return 1 if v else 0
+        return 1 if self._din.pins[idx].value() else 0
+
+    def _raw_read_all(self) -> bytearray:
+        # Returns the shared scratch buffer; copy before handing it out
+        levels = self._levels
+        _gpio_snapshot(self._pin_bytes, len(levels), levels)
+        return levels
 
     def _sync_last(self, indices=None) -> None:
+        levels = self._raw_read_all()
         if indices is None:
-            indices = range(len(self._pins))
+            indices = self._all_indices
+        last = self._last
+        pressed = self._pressed
+        invert = self._invert
         for i in indices:
-            self._last[i] = self._raw_read(i)
+            last[i] = levels[i]
+            pressed[i] = levels[i] ^ invert[i]
 
     @staticmethod
-    def _get_click_list(parent, indices: list[int]) -> list[bool]:
-        click_states = []
-        for idx in indices:
-            if parent._click_latch[idx]:
-                parent._click_latch[idx] = 0
-                parent._last[idx] = parent._raw_read(idx)
-                click_states.append(True)
-                continue
-
-            current = parent._raw_read(idx)
-            last = parent._last[idx]
-            if parent._active_type[idx] == Button.ACTIVE_HIGH:
-                curr_act, last_act = current, last
-            else:
-                curr_act, last_act = 1 - current, 1 - last
-            clicked = (last_act == 0) and (curr_act == 1)
-            click_states.append(clicked)
-            parent._last[idx] = current
-        return click_states
+    def _get_click_list(parent, sel: bytes) -> bytearray:
+        levels = parent._raw_read_all()
+        out = bytearray(len(sel))
+        _click_scan(sel, len(sel), levels, parent._last, parent._invert, parent._click_latch, out)
+        return out
 
     @staticmethod
     def _get_active_type_list(parent, indices: list[int]) -> list[bool]:
-        return [parent._active_type[i] for i in indices]
+        if indices is parent._all_indices:
+            return [not inv for inv in parent._invert]
+        return [not parent._invert[i] for i in indices]
 
     @staticmethod
     def _set_active_type_all(parent, active_type: bool, indices: list[int]) -> None:
         pull_din = ticle.Din.PULL_DOWN if active_type else ticle.Din.PULL_UP
+        inv = 0 if active_type else 1
+        invert = parent._invert
+        din = parent._din
+        applied = parent._pull_applied
+        changed = []
         for i in indices:
-            parent._active_type[i] = active_type
-            parent._din[i].pull = pull_din
+            if invert[i] != inv or not applied[i]:
+                invert[i] = inv
+                din[i].pull = pull_din
+                applied[i] = 1
+                changed.append(i)
+        if not changed:
+            return
         try:
             utime.sleep_ms(1) 
         except:
             pass
-        parent._sync_last(indices)
+        parent._sync_last(changed)
 
     @staticmethod
     def _get_measurement_list(parent, indices: list[int]) -> list[bool]:
-        return [parent._measurement_enabled[i] for i in indices]
+        if indices is parent._all_indices:
+            return [m == 1 for m in parent._measurement_enabled]
+        return [parent._measurement_enabled[i] == 1 for i in indices]
 
     @staticmethod
     def _set_measurement_all(parent, enabled: bool, indices: list[int]) -> None:
         turned_on = []
+        flag = 1 if enabled else 0
+        measurement = parent._measurement_enabled
+        din = parent._din
         for i in indices:
-            if not parent._measurement_enabled[i] and enabled:
+            if flag and not measurement[i]:
                 turned_on.append(i)
-            parent._measurement_enabled[i] = enabled
-            parent._din[i].measurement = enabled
+            measurement[i] = flag
+            din[i].measurement = enabled
 
         if turned_on:
             parent._sync_last(turned_on)
 
+    @staticmethod
+    def _get_dropped_list(parent, indices: list[int]) -> list[int]:
+        if indices is parent._all_indices:
+            return list(parent._dropped)
+        return [parent._dropped[i] for i in indices]
+
     @staticmethod
     def _get_debounce_ms_list(parent, indices: list[int]) -> list[int]:
+        if indices is parent._all_indices:
+            return list(parent._debounce_ms)
         return [parent._debounce_ms[i] for i in indices]
 
     @staticmethod
     def _set_debounce_ms_all(parent, ms: int, indices: list[int]) -> None:
+        if not 0 <= ms <= _DEBOUNCE_MAX_MS:
+            raise ValueError("debounce_ms must be between 0 and 65535")
+        values = parent._debounce_ms
+        if indices is parent._all_indices:
+            values[:] = array.array('H', [ms] * len(values))
+            return
         for i in indices:
-            parent._debounce_ms[i] = ms
+            values[i] = ms
             
     @staticmethod
     def _get_double_click_window_ms_list(parent, indices: list[int]) -> list[int]:
+        if indices is parent._all_indices:
+            return list(parent._double_click_window_ms)
         return [parent._double_click_window_ms[i] for i in indices]
 
     @staticmethod
     def _set_double_click_window_ms_all(parent, ms: int, indices: list[int]) -> None:
+        if not 0 <= ms <= _TIMEOUT_MAX_MS:
+            raise ValueError("double_click_window_ms must be between 0 and 536870911")
+        if parent._double_click_window_uniform == ms:
+            return
+        values = parent._double_click_window_ms
+        if indices is parent._all_indices:
+            values[:] = array.array('I', [ms] * len(values))
+            parent._double_click_window_uniform = ms
+            return
         for i in indices:
-            parent._double_click_window_ms[i] = ms
+            values[i] = ms
+        parent._double_click_window_uniform = -1
 
     @staticmethod
     def _get_long_press_threshold_ms_list(parent, indices: list[int]) -> list[int]:
+        if indices is parent._all_indices:
+            return list(parent._long_press_threshold_ms)
         return [parent._long_press_threshold_ms[i] for i in indices]
 
     @staticmethod
     def _set_long_press_threshold_ms_all(parent, ms: int, indices: list[int]) -> None:
+        if not 0 <= ms <= _TIMEOUT_MAX_MS:
+            raise ValueError("long_press_threshold_ms must be between 0 and 536870911")
+        if parent._long_press_threshold_uniform == ms:
+            return
+        values = parent._long_press_threshold_ms
+        if indices is parent._all_indices:
+            values[:] = array.array('I', [ms] * len(values))
+            parent._long_press_threshold_uniform = ms
+            return
         for i in indices:
-            parent._long_press_threshold_ms[i] = ms
-
-    @staticmethod
-    def _get_on_clicked_list(parent, indices: list[int]) -> list[callable]:
-        return [parent._on_clicked[i] for i in indices]
-
-    @staticmethod
-    def _set_on_clicked_all(parent, callback: callable, indices: list[int]) -> None:
-        for i in indices:
-            parent._on_clicked[i] = callback
-
-    @staticmethod
-    def _get_on_double_clicked_list(parent, indices: list[int]) -> list[callable]:
-        return [parent._on_double_clicked[i] for i in indices]
-
-    @staticmethod
-    def _set_on_double_clicked_all(parent, callback: callable, indices: list[int]) -> None:
-        for i in indices:
-            parent._on_double_clicked[i] = callback
-
-    @staticmethod
-    def _get_on_long_pressed_list(parent, indices: list[int]) -> list[callable]:
-        return [parent._on_long_pressed[i] for i in indices]
+            values[i] = ms
+        parent._long_press_threshold_uniform = -1
 
-    @staticmethod
-    def _set_on_long_pressed_all(parent, callback: callable, indices: list[int]) -> None:
+    def _update_has_cb(self, indices: list[int]) -> None:
+        has_cb = self._has_cb
+        _, clicked, double_clicked, long_pressed, pressed, released = self._callbacks
         for i in indices:
-            parent._on_long_pressed[i] = callback
-
-    @staticmethod
-    def _get_on_pressed_list(parent, indices: list[int]) -> list[callable]:
-        return [parent._on_pressed[i] for i in indices]
+            any_cb = 1 if (clicked[i] or double_clicked[i] or long_pressed[i]
+                           or pressed[i] or released[i]) else 0
+            if any_cb and not has_cb[i]:
+                # State machine was idle while unobserved; restart it cleanly
+                self._fsm_state[i] = _ST_IDLE
+                self._cancel_timer(i)
+            has_cb[i] = any_cb
 
     @staticmethod
-    def _set_on_pressed_all(parent, callback: callable, indices: list[int]) -> None:
-        for i in indices:
-            parent._on_pressed[i] = callback
+    def _get_on_list(parent, ev: int, indices: tuple) -> tuple:
+        callbacks = parent._callbacks[ev]
+        if indices is parent._all_indices:
+            return tuple(callbacks)
+        return tuple([callbacks[i] for i in indices])
 
     @staticmethod
-    def _get_on_released_list(parent, indices: list[int]) -> list[callable]:
-        return [parent._on_released[i] for i in indices]
+    def _set_on_all(parent, ev: int, callback: callable, indices: tuple) -> None:
+        Button._set_on_many(parent, {ev: callback}, indices)
 
     @staticmethod
-    def _set_on_released_all(parent, callback: callable, indices: list[int]) -> None:
-        for i in indices:
-            parent._on_released[i] = callback
+    def _set_on_many(parent, callbacks: dict, indices: tuple) -> None:
+        # callbacks maps event code -> callback
+        whole = indices is parent._all_indices
+        for ev, callback in callbacks.items():
+            dest = parent._callbacks[ev]
+            if whole:
+                dest[:] = [callback] * len(dest)
+            else:
+                for i in indices:
+                    dest[i] = callback
+        parent._update_has_cb(indices)
 
     class _ButtonView:
-        def __init__(self, parent: "Button", indices: list[int]):
+        def __init__(self, parent: "Button", indices: tuple):
             self._parent = parent
-            self._indices = indices
+            self._indices = indices     # always a tuple; slicing it yields a tuple
+            self._n = len(indices)
+            # Poll-path helpers resolved once per view (views are cached by Button)
+            self._read_all = parent._raw_read_all
+            self._get_click = Button._get_click_list
+            # Pin selector for _click_scan, built once so b[i].click allocates only its result
+            self._sel = parent._all_sel if indices is parent._all_indices else bytes(indices)
 
         def __getitem__(self, idx: int | slice) -> "Button._ButtonView":
             if isinstance(idx, slice):
-                selected_indices = [self._indices[i] for i in range(*idx.indices(len(self._indices)))]
-                return Button._ButtonView(self._parent, selected_indices)
+                return Button._ButtonView(self._parent, self._indices[idx])
             else:
-                return Button._ButtonView(self._parent, [self._indices[idx]])
+                return self._parent._views_single[self._indices[idx]]
 
         def __len__(self) -> int:
-            return len(self._indices)
+            return self._n
 
         @property
         def active_type(self) -> list[bool]:
@@ -412,6 +673,11 @@ class Button:
         def measurement(self, enabled: bool):
             Button._set_measurement_all(self._parent, enabled, self._indices)
 
+        @property
+        def dropped(self) -> list[int]:
+            # Events lost because the callback queue was full
+            return Button._get_dropped_list(self._parent, self._indices)
+
         @property
         def debounce_ms(self) -> list[int]:
             return Button._get_debounce_ms_list(self._parent, self._indices)
@@ -437,62 +703,47 @@ class Button:
             Button._set_long_press_threshold_ms_all(self._parent, ms, self._indices)
 
         @property
-        def value(self) -> list[int]:
-            return [self._parent._raw_read(i) for i in self._indices]
-
-        @property
-        def pressed(self) -> list[bool]:
-            out = []
+        def value(self) -> bytearray:
+            # One byte per pin (0/1); the scratch buffer is copied, never shared
+            levels = self._read_all()
+            if self._indices is self._parent._all_indices:
+                return bytearray(levels)
+            out = bytearray(self._n)
+            k = 0
             for i in self._indices:
-                raw = self._parent._raw_read(i)
-                if self._parent._active_type[i] == Button.ACTIVE_HIGH:
-                    out.append(bool(raw))     # HIGH = pressed
-                else:
-                    out.append(bool(1 - raw)) # LOW  = pressed
+                out[k] = levels[i]
+                k += 1
             return out
 
         @property
-        def click(self) -> list[bool]:
-            return Button._get_click_list(self._parent, self._indices)
-
-        @property
-        def on_clicked(self) -> list[callable]:
-            return Button._get_on_clicked_list(self._parent, self._indices)
-
-        @on_clicked.setter
-        def on_clicked(self, callback: callable):
-            Button._set_on_clicked_all(self._parent, callback, self._indices)
-
-        @property
-        def on_double_clicked(self) -> list[callable]:
-            return Button._get_on_double_clicked_list(self._parent, self._indices)
-
-        @on_double_clicked.setter
-        def on_double_clicked(self, callback: callable):
-            Button._set_on_double_clicked_all(self._parent, callback, self._indices)
-
-        @property
-        def on_long_pressed(self) -> list[callable]:
-            return Button._get_on_long_pressed_list(self._parent, self._indices)
-
-        @on_long_pressed.setter
-        def on_long_pressed(self, callback: callable):
-            Button._set_on_long_pressed_all(self._parent, callback, self._indices)
-
-        @property
-        def on_pressed(self) -> list[callable]:
-            return Button._get_on_pressed_list(self._parent, self._indices)
-
-        @on_pressed.setter
-        def on_pressed(self, callback: callable):
-            Button._set_on_pressed_all(self._parent, callback, self._indices)
+        def pressed(self) -> bytearray:
+            levels = self._read_all()
+            invert = self._parent._invert
+            out = bytearray(self._n)
+            k = 0
+            for i in self._indices:
+                out[k] = levels[i] ^ invert[i]
+                k += 1
+            return out
 
         @property
-        def on_released(self) -> list[callable]:
-            return Button._get_on_released_list(self._parent, self._indices)
-
-        @on_released.setter
-        def on_released(self, callback: callable):
-            Button._set_on_released_all(self._parent, callback, self._indices)
+        def click(self) -> bytearray:
+            return self._get_click(self._parent, self._sel)
+
+        on_clicked = _callback_property(_EV_CLICKED)
+        on_double_clicked = _callback_property(_EV_DOUBLE_CLICKED)
+        on_long_pressed = _callback_property(_EV_LONG_PRESSED)
+        on_pressed = _callback_property(_EV_PRESSED)
+        on_released = _callback_property(_EV_RELEASED)
+
+        def bulk_set_callbacks(self, **callbacks) -> None:
+            # e.g. btn[:].bulk_set_callbacks(on_pressed=f, on_clicked=None)
+            by_event = {}
+            for name in callbacks:
+                ev = _CB_EVENTS.get(name)
+                if ev is None:
+                    raise TypeError("unknown callback: " + name)
+                by_event[ev] = callbacks[name]
+            Button._set_on_many(self._parent, by_event, self._indices)
 
 
@@ -2,11 +2,53 @@ __version__ = "1.0.0"
 __author__ = "PlanX Lab Development Team"
 
 from . import (
-    utime,
+    utime, array,
     machine, micropython,
 )
 
 
+_ticks_ms = utime.ticks_ms
+_ticks_diff = utime.ticks_diff
+_ticks_add = utime.ticks_add
+_time_pulse_us = machine.time_pulse_us
+
+@micropython.viper
+def _nec_bits(pin, lo: int, hi: int, one: int, out: ptr32) -> int:
+    # 32 NEC data bits, LSB first; returns 0 or the KY022 error code to raise
+    pulse = _time_pulse_us
+    val = uint(0)
+    for _ in range(32):
+        m = int(pulse(pin, 0, 3000))    # ~560
+        if m < 0:
+            return -3                   # BADBLOCK
+        if m < lo or m > hi:
+            return -6                   # BADDATA
+        s = int(pulse(pin, 1, 5000))    # ~560 / ~1690
+        if s < 0:
+            return -3
+        val >>= 1
+        if s > one:
+            val |= uint(1) << 31
+    out[0] = val
+    return 0
+
+@micropython.viper
+def _hvac_bits(pin, nbits: int, thr: int, buf: ptr8, nbuf: int) -> int:
+    # nbits LSB-first space-coded bits into buf; returns 0 or the KY022 error code
+    pulse = _time_pulse_us
+    for i in range(nbuf):
+        buf[i] = 0
+    for i in range(nbits):
+        if int(pulse(pin, 0, 8000)) < 0:
+            return -6                   # BADDATA
+        sp = int(pulse(pin, 1, 20000))
+        if sp < 0:
+            return -3                   # BADBLOCK
+        if sp > thr:
+            buf[i >> 3] |= 1 << (i & 7)
+    return 0
+
+
 class KY022:
     REPEAT   = -1
     BADSTART = -2
@@ -50,6 +92,7 @@ class KY022:
                  hvac_hdr_space_us: int = 4500    # leader space Approximate width(No repeat frames, usually 4.5ms or more)
     ):
         self.__proto = int(protocol)        
+        self.__hvac_like = self.__proto in (self.PROTOCOL_CARRIER40, self.PROTOCOL_CARRIER84, self.PROTOCOL_CARRIER128, self.PROTOCOL_HVAC_NEC)
         self.__on_receive = on_receive
         self.__capturing = False 
 
@@ -60,6 +103,8 @@ class KY022:
         self.__cmd_last  = None
         # NEC/Samsung
         self.__nec_one_bound = 1120  # 0/1 Boundary (~1.12ms)
+        self.__nec_word = array.array('I', [0])  # _nec_bits result
+        self.__nec_addr8 = self.__proto == self.PROTOCOL_NEC_8  # a/~a address check
         # NEC Repeat/Emit/Throttle
         self.__emit_repeat = bool(emit_repeat)
         self.__repeat_first_delay_ms = int(repeat_first_delay_ms)
@@ -72,6 +117,8 @@ class KY022:
         self.__last_emit_addr = 0
         # SIRC
         self.__sirc_T = 600  # us
+        p = self.__proto
+        self.__sirc_bits = 12 if p == self.PROTOCOL_SIRC12 else (15 if p == self.PROTOCOL_SIRC15 else 20)
         # RC5/RC6 (Half bit T)
         self.__rc5_T = 889   # us
         self.__rc6_T = 444   # us
@@ -89,12 +136,33 @@ class KY022:
         self.__hvac_one_us = int(hvac_one_space_us)
         self.__hvac_hdr_mark = int(hvac_hdr_mark_us)
         self.__hvac_hdr_space = int(hvac_hdr_space_us)
+        if p == self.PROTOCOL_HVAC_NEC:
+            self.__hvac_frame_bits = self.__hvac_bits
+        else:
+            self.__hvac_frame_bits = 40 if p == self.PROTOCOL_CARRIER40 else (84 if p == self.PROTOCOL_CARRIER84 else 128)
+        # (lo, hi) tolerance windows; tol_pct is fixed, so these never change
+        self.__nec_hdr_b = self.__bounds(9000)
+        self.__nec_mark_b = self.__bounds(560)
+        self.__sirc_t1_b = self.__bounds(self.__sirc_T)
+        self.__sirc_t2_b = self.__bounds(2 * self.__sirc_T)
+        self.__sirc_t4_b = self.__bounds(4 * self.__sirc_T)
+        self.__pana_hdr_mark_b = self.__bounds(self.__pana_hdr_mark)
+        self.__pana_hdr_space_b = self.__bounds(self.__pana_hdr_space)
+        self.__hvac_hdr_mark_b = self.__bounds(self.__hvac_hdr_mark)
+        self.__hvac_hdr_space_b = self.__bounds(self.__hvac_hdr_space)
+        self.__rc6_hdr_mark_b = self.__bounds(self.__rc6_hdr_mark)
+        self.__rc6_hdr_space_b = self.__bounds(self.__rc6_hdr_space)
         # Queue
-        self.__q  = [None] * max(2, int(queue_size))
+        self.__qn = max(2, int(queue_size))
+        self.__qc = array.array('i', [0] * self.__qn)  # cmd
+        self.__qa = array.array('I', [0] * self.__qn)  # addr
+        self.__qe = array.array('I', [0] * self.__qn)  # ext
         self.__qh = 0
         self.__qt = 0
         # IRQ Trigger
         self.__irq_trigger = irq_trigger if irq_trigger is not None else machine.Pin.IRQ_FALLING
+        self.__hvac_buf = bytearray(max(5, (self.__hvac_frame_bits + 7) // 8))  # _hvac_bits result
+        self.__capture_frame = self.__select_capture()
         self.__ir_rx = machine.Pin(pin, machine.Pin.IN, machine.Pin.PULL_UP)
         self.__ir_rx.irq(handler=self.__cb_start, trigger=self.__irq_trigger)
 
@@ -112,12 +180,12 @@ class KY022:
     def get(self, block=False, timeout_ms=1000):
         if not block:
             return self.__q_get_nowait()
-        deadline = utime.ticks_add(utime.ticks_ms(), int(timeout_ms))
+        deadline = _ticks_add(_ticks_ms(), int(timeout_ms))
         while True:
             evt = self.__q_get_nowait()
             if evt is not None:
                 return evt
-            if utime.ticks_diff(deadline, utime.ticks_ms()) <= 0:
+            if _ticks_diff(deadline, _ticks_ms()) <= 0:
                 return None
             utime.sleep_ms(1)
 
@@ -154,32 +222,38 @@ class KY022:
             raise RuntimeError(self.BADBLOCK)
         return us
 
-    def __close(self, val, tgt, tol_pct):
-        tol_abs = (tgt * tol_pct) // 100
-        return abs(val - tgt) <= tol_abs  # abs(val - tgt) * 100 <= tgt * tol_pct
+    def __bounds(self, tgt):
+        tol_abs = (tgt * self.__tol_pct) // 100
+        return (tgt - tol_abs, tgt + tol_abs)
 
-    def __capture_frame(self):
+    def __select_capture(self):
+        # The protocol is fixed at construction, so the frame decoder is bound once
         p = self.__proto
         if p in (self.PROTOCOL_NEC_8, self.PROTOCOL_NEC_16, self.PROTOCOL_SAMSUNG):
-            return self.__cap_nec_like()
+            return self.__cap_nec_like
         if p in (self.PROTOCOL_SIRC12, self.PROTOCOL_SIRC15, self.PROTOCOL_SIRC20):
-            return self.__cap_sirc()
+            return self.__cap_sirc
         if p == self.PROTOCOL_PANA:
-            return self.__cap_panasonic()
+            return self.__cap_panasonic
         if p == self.PROTOCOL_RC5:
-            return self.__cap_rc5()
+            return self.__cap_rc5
         if p == self.PROTOCOL_RC6:
-            return self.__cap_rc6()
+            return self.__cap_rc6
         if p in (self.PROTOCOL_CARRIER40, self.PROTOCOL_CARRIER84, self.PROTOCOL_CARRIER128, self.PROTOCOL_HVAC_NEC):
-            return self.__cap_hvac_nec()
+            return self.__cap_hvac_nec
+        return self.__cap_invalid
+
+    def __cap_invalid(self):
         raise RuntimeError(self.BADBLOCK)
 
     def __cap_nec_like(self):
         mark1  = self.__pulse(0, 40000)  # ~9ms
         space1 = self.__pulse(1, 40000)  # 4.5ms(normal) / 2.25ms(repeat)
 
-        if not self.__close(mark1, 9000, self.__tol_pct):
+        lo, hi = self.__nec_hdr_b
+        if not (lo <= mark1 <= hi):
             raise RuntimeError(self.BADSTART)
+        lo, hi = self.__nec_mark_b  # data/repeat mark
 
         normal = space1 > 3000
         repeat = 1700 < space1 <= 3000
@@ -191,23 +265,16 @@ class KY022:
                 m2 = self.__pulse(0, 5000)
             except RuntimeError:
                 raise RuntimeError(self.BADREP)
-            if not self.__close(m2, 560, self.__tol_pct):
+            if not (lo <= m2 <= hi):
                 raise RuntimeError(self.BADREP)
             if self.__cmd_last is None:
                 raise RuntimeError(self.BADREP)
             return (self.__cmd_last, self.__addr_last, 0, True)
 
-        val = 0
-        pulse = self.__pulse
-        nec_one = self.__nec_one_bound
-        for _ in range(32):
-            m = pulse(0, 3000)   # ~560
-            if not self.__close(m, 560, self.__tol_pct):
-                raise RuntimeError(self.BADDATA)
-            s = pulse(1, 5000)   # ~560 / ~1690
-            val >>= 1
-            if s > nec_one:
-                val |= 0x80000000
+        rc = _nec_bits(self.__ir_rx, lo, hi, self.__nec_one_bound, self.__nec_word)
+        if rc:
+            raise RuntimeError(rc)
+        val = self.__nec_word[0]
 
         a  = val & 0xFF
         na = (val >> 8 ) & 0xFF
@@ -216,7 +283,7 @@ class KY022:
         if (c ^ nc) & 0xFF != 0xFF:
             raise RuntimeError(self.BADDATA)
 
-        if self.__proto == self.PROTOCOL_NEC_8:
+        if self.__nec_addr8:
             if (a ^ na) & 0xFF != 0xFF:
                 raise RuntimeError(self.BADADDR)
             addr = a
@@ -227,21 +294,29 @@ class KY022:
         return (cmd, addr, 0, False)
 
     def __cap_sirc(self):
-        T = self.__sirc_T
+        t1_lo, t1_hi = self.__sirc_t1_b
+        t2_lo, t2_hi = self.__sirc_t2_b
+        t4_lo, t4_hi = self.__sirc_t4_b
         m = self.__pulse(0, 25000)
         s = self.__pulse(1, 25000)
-        if not (self.__close(m, 4*T, self.__tol_pct) and self.__close(s, 1*T, self.__tol_pct)):
+        if not (t4_lo <= m <= t4_hi and t1_lo <= s <= t1_hi):
             raise RuntimeError(self.BADSTART)
 
-        bits = 12 if self.__proto == self.PROTOCOL_SIRC12 else (15 if self.__proto == self.PROTOCOL_SIRC15 else 20)
+        bits = self.__sirc_bits
         val = 0
+        pulse = _time_pulse_us
+        pin = self.__ir_rx
         for i in range(bits):
-            dm = self.__pulse(0, 4000)  # ~1T
-            ds = self.__pulse(1, 4000)  # 1T or 2T
-            if not self.__close(dm, 1*T, self.__tol_pct):
+            dm = pulse(pin, 0, 4000)  # ~1T
+            if dm < 0:
+                raise RuntimeError(self.BADBLOCK)
+            ds = pulse(pin, 1, 4000)  # 1T or 2T
+            if ds < 0:
+                raise RuntimeError(self.BADBLOCK)
+            if not (t1_lo <= dm <= t1_hi):
                 raise RuntimeError(self.BADDATA)
-            b = 1 if self.__close(ds, 2*T, self.__tol_pct) else 0
-            val |= (b << i)
+            if t2_lo <= ds <= t2_hi:
+                val |= (1 << i)
 
         cmd =  val        & 0x7F
         if bits == 12:
@@ -256,17 +331,25 @@ class KY022:
     def __cap_panasonic(self):
         m = self.__pulse(0, 30000)
         s = self.__pulse(1, 30000)
-        if not (self.__close(m, self.__pana_hdr_mark, self.__tol_pct) and
-                self.__close(s, self.__pana_hdr_space, self.__tol_pct)):
+        m_lo, m_hi = self.__pana_hdr_mark_b
+        s_lo, s_hi = self.__pana_hdr_space_b
+        if not (m_lo <= m <= m_hi and s_lo <= s <= s_hi):
             raise RuntimeError(self.BADSTART)
 
         bits = self.__pana_bits
+        # Nearer to one_space than zero_space <=> 2*sp > one_space + zero_space
+        thr2 = self.__pana_one_space + self.__pana_zero_space
         val = 0
+        pulse = _time_pulse_us
+        pin = self.__ir_rx
         for i in range(bits):
-            _m = self.__pulse(0, 3000)  # ~430
-            sp = self.__pulse(1, 5000)  # 430 / 1290
-            b = 1 if abs(sp - self.__pana_one_space) < abs(sp - self.__pana_zero_space) else 0
-            val |= (b << i)
+            if pulse(pin, 0, 3000) < 0:  # ~430
+                raise RuntimeError(self.BADBLOCK)
+            sp = pulse(pin, 1, 5000)     # 430 / 1290
+            if sp < 0:
+                raise RuntimeError(self.BADBLOCK)
+            if sp + sp > thr2:
+                val |= (1 << i)
 
         addr = (val) & 0xFFFF
         data = ((val >>16)) & 0xFFFFFFFF
@@ -275,45 +358,31 @@ class KY022:
         return (cmd, addr, ext, False)
 
     def __cap_hvac_nec(self):
-        p = self.__proto
-        if p in (self.PROTOCOL_CARRIER40, self.PROTOCOL_CARRIER84, self.PROTOCOL_CARRIER128):
-            bits = 40 if p == self.PROTOCOL_CARRIER40 else (84 if p == self.PROTOCOL_CARRIER84 else 128)
-        if p == self.PROTOCOL_HVAC_NEC:
-            if self.__hvac_bits <= 0:
-                raise RuntimeError(self.BADBLOCK)
-            bits = self.__hvac_bits
+        bits = self.__hvac_frame_bits
+        if bits <= 0:
+            raise RuntimeError(self.BADBLOCK)
 
-        hdr_mark = self.__hvac_hdr_mark
-        hdr_space = self.__hvac_hdr_space
         zero_us = self.__hvac_zero_us
         one_us = self.__hvac_one_us
 
         m = self.__pulse(0, 50000)
         s = self.__pulse(1, 50000)
-        if not (self.__close(m, hdr_mark, self.__tol_pct) and self.__close(s, hdr_space, self.__tol_pct)):
+        m_lo, m_hi = self.__hvac_hdr_mark_b
+        s_lo, s_hi = self.__hvac_hdr_space_b
+        if not (m_lo <= m <= m_hi and s_lo <= s <= s_hi):
             if not (m >= 2500 and s >= 3000):
                 raise RuntimeError(self.BADSTART)
 
-        val = 0
-        thr = (zero_us + one_us) // 2
-        pulse = self.__pulse
+        buf = self.__hvac_buf
+        rc = _hvac_bits(self.__ir_rx, bits, (zero_us + one_us) // 2, buf, len(buf))
+        if rc:
+            raise RuntimeError(rc)
 
-        for i in range(bits):
-            try:
-                mbit = pulse(0, 8000)
-            except RuntimeError:
-                raise RuntimeError(self.BADDATA)
-            if not (300 <= mbit <= 1200):
-                pass
-            sp = pulse(1, 20000)
-            b = 1 if sp > thr else 0
-            val |= (b << i)
-
-        b0 = val & 0xFF
-        b1 = (val >> 8 ) & 0xFF
-        b2 = (val >> 16) & 0xFF
-        b3 = (val >> 24) & 0xFF
-        b4 = (val >> 32) & 0xFF if bits >= 40 else 0
+        b0 = buf[0]
+        b1 = buf[1]
+        b2 = buf[2]
+        b3 = buf[3]
+        b4 = buf[4] if bits >= 40 else 0
 
         cmd = b0
         addr = b1 | (b2 << 8)
@@ -321,137 +390,106 @@ class KY022:
 
         return (cmd, addr, ext, False)
 
-    def __cap_rc5(self):
-        T = self.__rc5_T
-        half = []
-        lvl = 0 
-        for _ in range(40):
-            try:
-                d0 = self.__pulse(0, 4000)  # Low
-                n0 = max(1, min(2, int((d0 + T//2)//T)))
-                for _ in range(n0):
-                    half.append(lvl); lvl ^= 1
-                d1 = self.__pulse(1, 4000)  # High
-                n1 = max(1, min(2, int((d1 + T//2)//T)))
-                for _ in range(n1):
-                    half.append(lvl); lvl ^= 1
-            except RuntimeError:
-                break
-            if len(half) >= 28:  # 14bit * 2 half
-                break
-        if len(half) < 28:
-            raise RuntimeError(self.BADBLOCK)
-
-        def to_bits(offset):
-            bits = []
-            i = offset
-            while i + 1 < len(half) and len(bits) < 14:
-                a, b = half[i], half[i+1]
-                bits.append(1 if (a == 0 and b == 1) else 0)  # 01->1, 10->0
-                i += 2
-            return bits
-
-        cand0, cand1 = to_bits(0), to_bits(1)
-        bits = None
-        if len(cand0) >= 2 and cand0[0] == 1 and cand0[1] == 1:
-            bits = cand0
-        elif len(cand1) >= 2 and cand1[0] == 1 and cand1[1] == 1:
-            bits = cand1
-        else:
-            raise RuntimeError(self.BADSTART)
-        
-        if len(bits) < 14:
-            raise RuntimeError(self.BADBLOCK)
+    def __manchester(self, T, timeout, nbits, one_first, seed, wide_bit):
+        # One pass over the pulse widths: every pulse covers 1..3 half-bit units of
+        # its own level, and bit k is read from its first and second half units.
+        # Returns the bits MSB first. seed >= 0 supplies an unseen leading unit
+        # (RC5's idle-high first half); wide_bit is the double-width bit (RC6 trailer).
+        pulse = _time_pulse_us
+        pin = self.__ir_rx
+        rnd = T // 2
+        nmax = 2 if wide_bit < 0 else 3
+        val = 0
+        k = 0
+        pos = 0
+        w = 2 if wide_bit == 0 else 1
+        first = 0
+        second = w
+        a = 0
+        if seed >= 0:
+            a = seed
+            pos = 1
+        lvl = 0
+        while True:
+            d = pulse(pin, lvl, timeout)
+            if d < 0:
+                if lvl == 0:
+                    raise RuntimeError(self.BADBLOCK)
+                n = 4  # line went idle (high): the remaining halves are high
+            else:
+                n = (d + rnd) // T
+                if n < 1 or n > nmax:
+                    raise RuntimeError(self.BADDATA)
+            for _ in range(n):
+                if pos == first:
+                    a = lvl
+                elif pos == second:
+                    if a == lvl:
+                        raise RuntimeError(self.BADDATA)  # no mid-bit transition
+                    val = (val << 1) | (1 if a == one_first else 0)
+                    k += 1
+                    if k == nbits:
+                        return val
+                    first = pos + w
+                    w = 2 if k == wide_bit else 1
+                    second = first + w
+                pos += 1
+            if d < 0:
+                raise RuntimeError(self.BADBLOCK)
+            lvl ^= 1
 
-        S1, S2, Tgl = bits[0], bits[1], bits[2]
-        addr = 0
-        for b in bits[3:8]:
-            addr = (addr << 1) | b
-        
-        cmd = 0
-        for b in bits[8:14]:
-            cmd = (cmd << 1) | b
-        
+    def __cap_rc5(self):
+        # 14 bits: S1 S2 T A4..A0 C5..C0; '1' is high->low at the receiver output
+        val = self.__manchester(self.__rc5_T, 4000, 14, 1, 1, -1)
+        S2 = (val >> 12) & 1
+        Tgl = (val >> 11) & 1
+        addr = (val >> 6) & 0x1F
+        cmd = val & 0x3F
         if S2 == 0:
-            cmd |= 0x40
+            cmd |= 0x40  # RC5X field bit
         return (cmd, addr, Tgl, False)
 
     def __cap_rc6(self):
-        T = self.__rc6_T
         m = self.__pulse(0, 20000)
         s = self.__pulse(1, 20000)
-        if not (self.__close(m, self.__rc6_hdr_mark, self.__tol_pct) and self.__close(s, self.__rc6_hdr_space, self.__tol_pct)):
+        m_lo, m_hi = self.__rc6_hdr_mark_b
+        s_lo, s_hi = self.__rc6_hdr_space_b
+        if not (m_lo <= m <= m_hi and s_lo <= s <= s_hi):
             raise RuntimeError(self.BADSTART)
 
-        half = []
-        lvl = 0
-        for _ in range(50):
-            try:
-                d0 = self.__pulse(0, 5000); n0 = max(1, min(2, int((d0 + T//2)//T)))
-                for _ in range(n0):
-                    half.append(lvl); lvl ^= 1
-                d1 = self.__pulse(1, 5000); n1 = max(1, min(2, int((d1 + T//2)//T)))
-                for _ in range(n1):
-                    half.append(lvl); lvl ^= 1
-            except RuntimeError:
-                break
-            if len(half) >= 44:
-                break
-        if len(half) < 22:
-            raise RuntimeError(self.BADBLOCK)
-
-        def to_bits(offset):
-            bits = []
-            i = offset
-            while i + 1 < len(half) and len(bits) < 21:
-                a, b = half[i], half[i+1]
-                bits.append(1 if (a == 0 and b == 1) else 0)
-                i += 2
-            return bits
-
-        cand = []
-        for off in (0, 1):
-            b = to_bits(off)
-            if len(b) >= 5 and b[0] == 1 and b[1] == 0 and b[2] == 0 and b[3] == 0:
-                cand.append(b)
-        if not cand:
-            raise RuntimeError(self.BADSTART)
-        bits = cand[0]
-        nbits = min(len(bits), 21)
-
-        tgl = bits[4] if nbits > 4 else 0
-        idx = 5
-        addr = 0
-        for _ in range(8):
-            if idx >= nbits: break
-            addr = (addr << 1) | bits[idx]; idx += 1
-        cmd = 0
-        while idx < nbits and (idx - 5 - 8) < 8:
-            cmd = (cmd << 1) | bits[idx]; idx += 1
+        # 21 bits: start, mode(3), trailer(2T halves), A7..A0, C7..C0; '1' is low->high
+        val = self.__manchester(self.__rc6_T, 5000, 21, 0, -1, 4)
+        if (val >> 17) != 0b1000:
+            raise RuntimeError(self.BADSTART)  # start bit 1, mode 0
+        tgl = (val >> 16) & 1
+        addr = (val >> 8) & 0xFF
+        cmd = val & 0xFF
         return (cmd, addr, tgl, False)
 
+    @micropython.native
     def __finish_ok(self, cmd, addr, ext=0, is_repeat=False):
-        now_ms = utime.ticks_ms()
+        tdiff = _ticks_diff
+        now_ms = _ticks_ms()
 
         if is_repeat:
             if not self.__emit_repeat:
                 return
-            if utime.ticks_diff(now_ms, self.__last_full_ms) < self.__repeat_first_delay_ms:
+            if tdiff(now_ms, self.__last_full_ms) < self.__repeat_first_delay_ms:
                 return
-            if utime.ticks_diff(now_ms, self.__last_repeat_ms) < self.__repeat_min_interval_ms:
+            if tdiff(now_ms, self.__last_repeat_ms) < self.__repeat_min_interval_ms:
                 return
             self.__last_repeat_ms = now_ms
         else:
             self.__last_full_ms = now_ms
             self.__last_repeat_ms = 0
 
-        if self.__proto in (self.PROTOCOL_CARRIER40, self.PROTOCOL_CARRIER84, self.PROTOCOL_CARRIER128, self.PROTOCOL_HVAC_NEC):
+        if self.__hvac_like:
             base_cmd = cmd & ~0x0C
         else:
             base_cmd = cmd
 
         # Hold throttle
-        if self.__hold_throttle_ms > 0 and base_cmd == self.__last_emit_cmd and addr == self.__last_emit_addr and utime.ticks_diff(now_ms, self.__last_emit_ms) < self.__hold_throttle_ms:
+        if self.__hold_throttle_ms > 0 and base_cmd == self.__last_emit_cmd and addr == self.__last_emit_addr and tdiff(now_ms, self.__last_emit_ms) < self.__hold_throttle_ms:
             return
 
         self.__cmd_last = cmd if cmd >= 0 else self.__cmd_last
@@ -461,24 +499,26 @@ class KY022:
             except Exception:
                 pass
         else:
-            self.__q_put((cmd, addr, ext))
+            self.__q_put(cmd, addr, ext)
             
         self.__last_emit_ms = now_ms
         self.__last_emit_cmd = base_cmd
         self.__last_emit_addr = addr
 
-    def __q_put(self, evt):
-        nxt = (self.__qt + 1) % len(self.__q)
+    def __q_put(self, cmd, addr, ext):
+        nxt = (self.__qt + 1) % self.__qn
         if nxt == self.__qh:
-            self.__qh = (self.__qh + 1) % len(self.__q)
-        self.__q[self.__qt] = evt
+            self.__qh = (self.__qh + 1) % self.__qn
+        t = self.__qt
+        self.__qc[t] = cmd
+        self.__qa[t] = addr
+        self.__qe[t] = ext
         self.__qt = nxt
 
     def __q_get_nowait(self):
         if self.__qh == self.__qt:
             return None
-        evt = self.__q[self.__qh]
-        self.__q[self.__qh] = None
-        self.__qh = (self.__qh + 1) % len(self.__q)
-        return evt
+        h = self.__qh
+        self.__qh = (h + 1) % self.__qn
+        return (self.__qc[h], self.__qa[h], self.__qe[h])
 
@@ -2058,7 +2058,7 @@ def upload(local, remote, owner, repo, ref):
         if os.path.isfile(local_path):
             args[0] = local_path
             args[2] = os.path.splitext(local_path)[0] + ".mpy"
-            mpy_cross.run(*args)
+            _run_mpy_cross(args)
         else:
             for fn in os.listdir(local_path):
                 fp = os.path.join(local_path, fn)
@@ -2066,7 +2066,15 @@ def upload(local, remote, owner, repo, ref):
                     _conv_py_to_mpy(fp, base); continue
                 if not fp.endswith(".py"): continue
                 args[0] = fp; args[2] = _mpy_output_path(base, fp)
-                mpy_cross.run(*args)
+                _run_mpy_cross(args)
+
+    def _run_mpy_cross(args):
+        # Viper/native errors (e.g. ViperTypeError) only show up here, not under CPython
+        proc = mpy_cross.run(*args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        out, _ = proc.communicate()
+        if proc.returncode != 0:
+            msg = out.decode("utf-8", "replace").strip()
+            raise click.ClickException(f"mpy-cross failed for {args[0]}:\n{msg}")
 
     def _cache_marker_for_file(cache_file):
         d, b = os.path.dirname(cache_file), os.path.basename(cache_file)